@@ -1,3 +1,15 @@
-from .cli import app
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .cli import app
 
 __all__ = ("app",)
+
+
+def __getattr__(name: str) -> Any:
+    # 延迟导入 cli, 只使用模拟 api 时不需要加载 typer
+    if name == "app":
+        from .cli import app
+
+        return app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,114 @@
+import math
+from functools import lru_cache
+from math import comb
+
+from .models import MAX_GOALS, Aggregate, MatchModel
+from .types import Engine
+
+
+def goal_probs(model: MatchModel) -> tuple[float, float]:
+    """每分钟主队进球和客队进球的概率, 与 Game.attack 的模型一致"""
+    shot = model.shot_prob_per_minute
+    home = shot * model.home_shot_percentage * model.home_xg_per_shot
+    away = shot * (1 - model.home_shot_percentage) * model.away_xg_per_shot
+    return home, away
+
+
+@lru_cache(maxsize=4096)
+def tail_scorelines(
+    home_goal_prob: float, away_goal_prob: float, minutes: int
+) -> tuple[tuple[float, ...], ...]:
+    """剩余 minutes 分钟内的进球分布. 每分钟最多一方进一球,
+    所以主客队进球数服从三项分布, 只与剩余分钟数有关"""
+    none_prob = 1 - home_goal_prob - away_goal_prob
+    scorelines = [[0.0] * (MAX_GOALS + 1) for _ in range(MAX_GOALS + 1)]
+    for home in range(minutes + 1):
+        home_term = comb(minutes, home) * home_goal_prob**home
+        for away in range(minutes - home + 1):
+            prob = (
+                home_term
+                * comb(minutes - home, away)
+                * away_goal_prob**away
+                * none_prob ** (minutes - home - away)
+            )
+            scorelines[min(home, MAX_GOALS)][min(away, MAX_GOALS)] += prob
+    return tuple(tuple(row) for row in scorelines)
+
+
+# Dixon-Coles 修正的默认相关系数, 负值提高 0:0 和 1:1 的概率
+DIXON_COLES_RHO = -0.1
+# 解析引擎与各自使用的 rho
+RHO = {Engine.poisson: 0.0, Engine.dixon_coles: DIXON_COLES_RHO}
+
+
+def goal_rates(model: MatchModel, fulltime: int = 90) -> tuple[float, float]:
+    """全场主客队进球数的期望, 即泊松分布的参数"""
+    home_goal_prob, away_goal_prob = goal_probs(model)
+    return fulltime * home_goal_prob, fulltime * away_goal_prob
+
+
+def _poisson(rate: float) -> list[float]:
+    probs = [math.exp(-rate)]
+    for goals in range(1, MAX_GOALS):
+        probs.append(probs[-1] * rate / goals)
+    # 超过 MAX_GOALS 的进球数计入最后一格
+    probs.append(max(1 - sum(probs), 0.0))
+    return probs
+
+
+def poisson_scorelines(
+    home_rate: float, away_rate: float, rho: float = 0.0
+) -> list[list[float]]:
+    """主客队进球数相互独立的泊松分布的比分矩阵.
+    rho 不为 0 时按 Dixon-Coles 修正 0:0, 1:0, 0:1, 1:1 四个低比分,
+    修正前后总概率和双方进球数的期望都不变"""
+    factors = [
+        1 - home_rate * away_rate * rho,
+        1 + home_rate * rho,
+        1 + away_rate * rho,
+        1 - rho,
+    ]
+    if min(factors) < 0:
+        raise ValueError(f"rho {rho} is out of range for these rates")
+    home_probs = _poisson(home_rate)
+    away_probs = _poisson(away_rate)
+    scorelines = [[home * away for away in away_probs] for home in home_probs]
+    for (home, away), factor in zip([(0, 0), (0, 1), (1, 0), (1, 1)], factors):
+        scorelines[home][away] *= factor
+    return scorelines
+
+
+def exact(
+    model: MatchModel, fulltime: int = 90, rho: float = 0.0
+) -> Aggregate:
+    """由解析公式得到的一场比赛的期望结果, 各项为期望值, steps 为 1.
+    每分钟的进球率相同, 不区分进球时间"""
+    home_rate, away_rate = goal_rates(model, fulltime)
+    aggregate = model.new_aggregate(fulltime)
+    aggregate.scorelines = poisson_scorelines(home_rate, away_rate, rho)
+    aggregate.steps = 1
+    aggregate.exact = True
+    shot = model.shot_prob_per_minute
+    for team, rate, shot_prob, xg_per_shot in (
+        (
+            aggregate.home,
+            home_rate,
+            shot * model.home_shot_percentage,
+            model.home_xg_per_shot,
+        ),
+        (
+            aggregate.away,
+            away_rate,
+            shot * (1 - model.home_shot_percentage),
+            model.away_xg_per_shot,
+        ),
+    ):
+        # 射门次数服从二项分布, 进球数服从泊松分布, 平方项为二阶矩
+        shots = fulltime * shot_prob
+        team.shots = shots
+        team.shots_sq = shots * (1 - shot_prob) + shots**2
+        team.score = rate
+        team.score_sq = rate + rate**2
+        team.xg = shots * xg_per_shot
+        team.xg_sq = shots * 0.1**2 + team.shots_sq * xg_per_shot**2
+    return aggregate
@@ -2,35 +2,68 @@ import json
 import math
 import os
 import random
+import time
+from collections.abc import Iterable, Iterator
 from datetime import date as datelib
+from functools import cached_property
+from http import HTTPStatus
 from pathlib import Path
+from typing import TYPE_CHECKING
+
+from . import metrics
+from .analytic import RHO, exact, goal_probs, tail_scorelines
+from .cache import ResultCache
+from .files import FileLock, atomic_write
+from .models import (
+    MAX_GOALS,
+    Aggregate,
+    Comparison,
+    Distribution,
+    MatchModel,
+    Result,
+    Step,
+    StepTeam,
+)
+from .rng import entropy, spawn
+from .settings import Settings
+from .store import MatchStore
+from .types import Engine, MatchesTypes, MatchTypes, MetaTypes
 
-import httpx
-from dotenv import get_key
+if TYPE_CHECKING:
+    from concurrent.futures import Executor
 
-from .models import Result, ResultTeam, Step, StepTeam
-from .types import MatchesTypes, MatchTypes
+    import httpx
 
 MATCHES_URL = (
     "https://raw.githubusercontent.com/"
     "tanzhijian/score-simulator-data/release/matches.json"
 )
+# simulate_many 分配给进程池的最小单位
+STEPS_PER_CHUNK = 1000
+
 
+class BaseMatches:
+    """本地缓存相关的逻辑, 由同步的 Matches 和异步的 AsyncMatches 共用"""
 
-class Matches:
     def __init__(self) -> None:
         self._path: str | None = None
 
     def config(self, key: str, env_file: str = ".env") -> str | None:
+        from dotenv import get_key
+
         if (value := get_key(env_file, key)) is None:
             value = os.getenv(key)
         return value
 
+    @cached_property
+    def settings(self) -> Settings:
+        return Settings.load()
+
     @property
     def path(self) -> str | None:
         if self._path is not None:
             return self._path
-        return self.config("SCORE_SIMULATOR_DATA")
+        return self.settings.data
 
     @path.setter
     def path(self, value: str) -> None:
@@ -49,55 +82,342 @@ class Matches:
         if not self.directory.exists():
             self.directory.mkdir()
 
+    @property
+    def url(self) -> str:
+        return self.settings.url or MATCHES_URL
+
     @property
     def file(self) -> Path:
         return Path(self.directory, "matches.json")
 
-    def fetch(self) -> MatchesTypes:
-        proxy = self.config("SCORE_SIMULATOR_PROXY")
-        response = httpx.get(MATCHES_URL, proxies=proxy)
-        response.raise_for_status()
-        data: MatchesTypes = response.json()
-        return data
+    @property
+    def lock_file(self) -> Path:
+        return Path(self.directory, "matches.lock")
+
+    @property
+    def store_file(self) -> Path:
+        return Path(self.directory, "matches.db")
+
+    @property
+    def store(self) -> MatchStore:
+        """本地的比赛数据. matches.json 比 store 新时 (旧版本保存的数据
+        或手动修改) 由它重建"""
+        store = MatchStore(self.store_file)
+        if self.file.exists() and not store.is_current(self.file):
+            with open(self.file) as f:
+                store.build(json.load(f), self.file)
+        return store
+
+    def exists(self) -> bool:
+        """本地是否已有比赛数据"""
+        return self.store_file.exists() or self.file.exists()
+
+    @property
+    def results(self) -> ResultCache:
+        """数据目录下的模拟结果缓存"""
+        return ResultCache(
+            Path(self.directory, "results"), self.settings.cache_size
+        )
+
+    @property
+    def meta_file(self) -> Path:
+        return Path(self.directory, "matches.meta.json")
+
+    @property
+    def max_age(self) -> int:
+        return self.settings.max_age
 
     def read(self) -> MatchesTypes:
-        with open(self.file) as f:
-            data: MatchesTypes = json.load(f)
-        return data
+        with metrics.phase("matches.read"):
+            return self.store.read()
 
     def save(self, data: MatchesTypes) -> None:
+        """用 data 替换全部本地数据"""
         self.mkdir()
-        with open(self.file, "w") as f:
-            f.write(json.dumps(data, indent=2, ensure_ascii=False))
+        with metrics.phase("matches.save"):
+            MatchStore(self.store_file).build(data)
+            self.file.unlink(missing_ok=True)
 
-    def get(self) -> MatchesTypes:
+    def merge(self, data: MatchesTypes) -> list[str]:
+        """用完整的 data 更新本地数据, 返回新增, 变化或删除的日期.
+        合并后 store 成为唯一的本地数据, 旧版本的 matches.json 被删除"""
         self.mkdir()
-        if self.file.exists():
+        with metrics.phase("matches.save"):
+            changed = self.store.merge(data)
+            self.file.unlink(missing_ok=True)
+        metrics.count("matches.changed", len(changed))
+        return changed
+
+    def read_meta(self) -> MetaTypes | None:
+        if not self.meta_file.exists():
+            return None
+        with open(self.meta_file) as f:
+            meta: MetaTypes = json.load(f)
+        return meta
+
+    def save_meta(self, meta: MetaTypes) -> None:
+        self.mkdir()
+        atomic_write(self.meta_file, json.dumps(meta))
+
+    def is_fresh(self) -> bool:
+        """有校验信息时按 max_age 判断本地数据是否过期,
+        没有时 (旧版本保存的数据) 看本地数据是否包含今天的比赛"""
+        fresh = self._is_fresh()
+        metrics.count("cache.hit" if fresh else "cache.miss")
+        return fresh
+
+    def _is_fresh(self) -> bool:
+        if not self.exists():
+            return False
+        if (meta := self.read_meta()) is not None:
+            return time.time() - meta["fetched_at"] < self.max_age
+        today = datelib.today().strftime("%Y-%m-%d")
+        return today in self.store.dates()
+
+    def refresh_lock(self) -> FileLock | None:
+        """多个进程共用数据目录时只让一个进程更新.
+        返回已获得的锁时由调用者更新本地数据并释放锁; 返回 None 时不需要更新:
+        等待期间其他进程已经完成更新, 或者其他进程正在更新而本地已有旧数据"""
+        lock = FileLock(self.lock_file)
+        if not lock.acquire(blocking=not self.exists()):
+            metrics.count("lock.busy")
+            return None
+        if self._is_fresh():
+            lock.release()
+            return None
+        return lock
+
+    def conditional_headers(self) -> dict[str, str]:
+        """由上次请求保存的 ETag 和 Last-Modified 生成条件请求头"""
+        meta = self.read_meta() if self.exists() else None
+        headers = {}
+        if meta is not None:
+            if meta["etag"] is not None:
+                headers["If-None-Match"] = meta["etag"]
+            if meta["last_modified"] is not None:
+                headers["If-Modified-Since"] = meta["last_modified"]
+        return headers
+
+    def update(self, response: "httpx.Response") -> MatchesTypes:
+        """保存条件请求的结果, 304 时沿用本地数据.
+        返回保存后的本地数据, 与之后 read 和 select 的结果一致"""
+        meta = self.read_meta() if self.exists() else None
+        if response.status_code == HTTPStatus.NOT_MODIFIED and meta:
             data = self.read()
-
-            date = list(data.keys())[1]
-            today = datelib.today().strftime("%Y-%m-%d")
-            if date != today:
-                data = self.fetch()
-                self.save(data)
+            etag = response.headers.get("ETag", meta["etag"])
+            last_modified = response.headers.get(
+                "Last-Modified", meta["last_modified"]
+            )
         else:
-            data = self.fetch()
-            self.save(data)
+            self.merge(response.json())
+            data = self.read()
+            etag = response.headers.get("ETag")
+            last_modified = response.headers.get("Last-Modified")
+
+        self.save_meta(
+            {
+                "etag": etag,
+                "last_modified": last_modified,
+                "fetched_at": time.time(),
+            }
+        )
+        return data
+
+    def select(
+        self, date: str, matches: MatchesTypes | None = None
+    ) -> list[MatchTypes]:
+        """没有传入 matches 时只从 store 中读取这一天的比赛"""
+        if matches is not None:
+            return matches[date]
+        with metrics.phase("matches.select"):
+            return self.store.load(date)
+
+    def select_dates(
+        self,
+        dates: Iterable[str] | None = None,
+        start: str | None = None,
+        end: str | None = None,
+    ) -> Iterator[tuple[str, list[MatchTypes]]]:
+        """逐个日期读取比赛, store 的索引只解析一次.
+        没有传入 dates 时按顺序选出 store 中 start 到 end (包含) 之间的日期"""
+        store = self.store
+        if dates is None:
+            dates = sorted(
+                date
+                for date in store.dates()
+                if (start is None or date >= start)
+                and (end is None or date <= end)
+            )
+        for date in dates:
+            with metrics.phase("matches.select"):
+                matches = store.load(date)
+            yield date, matches
+
+
+class Matches(BaseMatches):
+    def request(
+        self, headers: dict[str, str] | None = None
+    ) -> "httpx.Response":
+        import httpx
+
+        with metrics.phase("matches.fetch"):
+            response = httpx.get(
+                self.url, headers=headers, proxies=self.settings.proxy
+            )
+        if response.status_code != HTTPStatus.NOT_MODIFIED:
+            response.raise_for_status()
+        return response
+
+    def fetch(self) -> MatchesTypes:
+        data: MatchesTypes = self.request().json()
         return data
 
-    def select(self, date: str, matches: MatchesTypes) -> list[MatchTypes]:
-        return matches[date]
+    def refresh(self) -> MatchesTypes:
+        """带上 ETag 和 Last-Modified 发送条件请求, 304 时沿用本地数据"""
+        return self.update(self.request(self.conditional_headers()))
+
+    def get(self) -> MatchesTypes:
+        self.mkdir()
+        if not self.is_fresh() and (lock := self.refresh_lock()) is not None:
+            with lock:
+                return self.refresh()
+        return self.read()
+
+    def sync(self) -> None:
+        """与 get 相同地更新本地数据, 但不解析全部数据"""
+        self.mkdir()
+        if not self.is_fresh() and (lock := self.refresh_lock()) is not None:
+            with lock:
+                self.refresh()
+
+
+class AsyncMatches(BaseMatches):
+    """使用共享连接池的异步版本, 请求带超时并在网络错误或 5xx 时指数退避重试"""
+
+    def __init__(
+        self,
+        timeout: float = 10,
+        retries: int = 3,
+        backoff: float = 0.5,
+        client: "httpx.AsyncClient | None" = None,
+    ) -> None:
+        super().__init__()
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self._client = client
+
+    @property
+    def client(self) -> "httpx.AsyncClient":
+        import httpx
+
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                proxies=self.settings.proxy,
+                timeout=httpx.Timeout(self.timeout),
+            )
+        return self._client
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def __aenter__(self) -> "AsyncMatches":
+        return self
+
+    async def __aexit__(self, *args: object) -> None:
+        await self.aclose()
+
+    async def request(
+        self, url: str | None = None, headers: dict[str, str] | None = None
+    ) -> "httpx.Response":
+        import asyncio
+
+        import httpx
+
+        if url is None:
+            url = self.url
+
+        for attempt in range(self.retries + 1):
+            try:
+                with metrics.phase("matches.fetch"):
+                    response = await self.client.get(url, headers=headers)
+                if response.status_code < 500:
+                    break
+                if attempt == self.retries:
+                    response.raise_for_status()
+            except httpx.TransportError:
+                if attempt == self.retries:
+                    raise
+            await asyncio.sleep(self.backoff * 2**attempt)
+
+        if response.status_code != HTTPStatus.NOT_MODIFIED:
+            response.raise_for_status()
+        return response
+
+    async def fetch(self, url: str | None = None) -> MatchesTypes:
+        data: MatchesTypes = (await self.request(url)).json()
+        return data
+
+    async def fetch_many(self, urls: list[str]) -> MatchesTypes:
+        """并发请求多个数据源或按日期拆分的文件, 按 urls 的顺序合并"""
+        import asyncio
+
+        data: MatchesTypes = {}
+        for part in await asyncio.gather(*(self.fetch(url) for url in urls)):
+            data |= part
+        return data
+
+    async def refresh(self) -> MatchesTypes:
+        headers = self.conditional_headers()
+        return self.update(await self.request(headers=headers))
+
+    async def get(self) -> MatchesTypes:
+        self.mkdir()
+        if not self.is_fresh() and (lock := await self._refresh_lock()):
+            with lock:
+                return await self.refresh()
+        return self.read()
+
+    async def sync(self) -> None:
+        self.mkdir()
+        if not self.is_fresh() and (lock := await self._refresh_lock()):
+            with lock:
+                await self.refresh()
+
+    async def _refresh_lock(self) -> FileLock | None:
+        """在线程中等待文件锁, 不阻塞事件循环"""
+        import asyncio
+
+        return await asyncio.to_thread(self.refresh_lock)
 
 
 class Game:
-    def __init__(self, match: MatchTypes) -> None:
+    def __init__(
+        self,
+        match: MatchTypes | MatchModel,
+        seed: int | random.Random | None = None,
+    ) -> None:
         self.match = match
+        if isinstance(seed, random.Random):
+            self.random = seed
+        else:
+            self.random = random.Random(seed)
+        if isinstance(match, MatchModel):
+            self.model = match
+        else:
+            self.model = MatchModel.from_match(match)
+
+    def numpy_seed(self) -> int:
+        """numpy 引擎的种子从 self.random 中取, 使其同样可以复现"""
+        return self.random.getrandbits(128)
 
     def generate_xg(self, mu: float, sigma: float = 0.1) -> float:
         """使用逆变换法生成正态分布的随机数来得到 xg, 标准差先使用一点假设的数值"""
-        u = random.random()
+        u = self.random.random()
         z = math.sqrt(-2 * math.log(u)) * math.cos(
-            2 * math.pi * random.random()
+            2 * math.pi * self.random.random()
         )
 
         xg = mu + sigma * z
@@ -108,46 +428,51 @@ class Game:
 
         return xg
 
+    def binomial(self, n: int, p: float) -> int:
+        """使用逆变换法生成二项分布的随机数"""
+        if p >= 1:
+            return n
+        u = self.random.random()
+        prob = (1 - p) ** n
+        cdf = prob
+        k = 0
+        while u > cdf and k < n:
+            prob *= (n - k) / (k + 1) * p / (1 - p)
+            k += 1
+            cdf += prob
+        return k
+
     def attack(self) -> Step:
         step = Step(home=StepTeam(), away=StepTeam())
+        model = self.model
 
-        home_xg_per_shot = (
-            self.match["home"]["xg"] / self.match["home"]["shots"]
-        )
-        away_xg_per_shot = (
-            self.match["away"]["xg"] / self.match["away"]["shots"]
-        )
-        home_shot_percentage = self.match["home"]["shots"] / (
-            self.match["home"]["shots"] + self.match["away"]["shots"]
-        )
-        shot_prob_per_minute = (
-            (self.match["home"]["shots"] + self.match["away"]["shots"])
-            / (
-                (self.match["home"]["played"] + self.match["away"]["played"])
-                / 2
-            )
-            / 90
-        )
-
-        if random.random() < shot_prob_per_minute:
-            if random.random() < home_shot_percentage:
+        if self.random.random() < model.shot_prob_per_minute:
+            if self.random.random() < model.home_shot_percentage:
                 step.home.shot = True
-                step.home.xg = self.generate_xg(home_xg_per_shot)
-                if random.random() < home_xg_per_shot:
+                step.home.xg = self.generate_xg(model.home_xg_per_shot)
+                if self.random.random() < model.home_xg_per_shot:
                     step.home.score = True
             else:
                 step.away.shot = True
-                step.away.xg = self.generate_xg(away_xg_per_shot)
-                if random.random() < away_xg_per_shot:
+                step.away.xg = self.generate_xg(model.away_xg_per_shot)
+                if self.random.random() < model.away_xg_per_shot:
                     step.away.score = True
         return step
 
-    def play(self, fulltime: int = 90) -> Result:
-        result = Result(
-            home=ResultTeam(name=self.match["home"]["name"]),
-            away=ResultTeam(name=self.match["away"]["name"]),
-            competition=self.match["competition"]["name"],
-        )
+    def play(
+        self, fulltime: int = 90, engine: Engine = Engine.python
+    ) -> Result:
+        """模拟一场比赛. 解析引擎只给出比分分布, 不能产生单场比赛"""
+        if engine in RHO:
+            raise ValueError(f"{engine.value} engine cannot play a match")
+        if engine == Engine.events:
+            return self.play_events(fulltime)
+        if engine == Engine.numpy:
+            from .batch import simulate
+
+            return simulate(self.model, fulltime, 1, self.numpy_seed()).mean()
+
+        result = self.model.new_result()
 
         for minute in range(fulltime):
             step = self.attack()
@@ -168,16 +493,381 @@ class Game:
 
         return result
 
-    def play_100(self, fulltime: int = 90, steps: int = 100) -> Result:
-        results = (self.play(fulltime) for _ in range(steps))
-        result = sum(
-            results,
-            Result(
-                home=ResultTeam(name=self.match["home"]["name"]),
-                away=ResultTeam(name=self.match["away"]["name"]),
-                competition=self.match["competition"]["name"],
-                timing=fulltime,
-                played=True,
-            ),
+    def play_events(self, fulltime: int = 90) -> Result:
+        """先抽样整场的射门次数再分配到分钟上, 只为射门生成 xg 和进球,
+        与逐分钟的 play 分布相同"""
+        model = self.model
+        result = model.new_result()
+
+        shots = self.binomial(fulltime, model.shot_prob_per_minute)
+        for minute in sorted(self.random.sample(range(fulltime), shots)):
+            if self.random.random() < model.home_shot_percentage:
+                result.home.shots += 1
+                result.home.xg += self.generate_xg(model.home_xg_per_shot)
+                if self.random.random() < model.home_xg_per_shot:
+                    result.home.score += 1
+                    result.home.goal_minutes.append(minute)
+            else:
+                result.away.shots += 1
+                result.away.xg += self.generate_xg(model.away_xg_per_shot)
+                if self.random.random() < model.away_xg_per_shot:
+                    result.away.score += 1
+                    result.away.goal_minutes.append(minute)
+
+        result.timing = fulltime
+        result.played = True
+
+        return result
+
+    def simulate(
+        self,
+        fulltime: int = 90,
+        steps: int = 100,
+        engine: Engine = Engine.python,
+        antithetic: bool = False,
+    ) -> Aggregate:
+        """模拟 steps 场比赛, 逐场累加到 Aggregate 中.
+        解析引擎直接返回精确的期望结果, 忽略 steps.
+        antithetic 为 True 时使用对偶随机数, 只支持 numpy 引擎"""
+        if antithetic and engine != Engine.numpy:
+            raise ValueError("antithetic variates need the numpy engine")
+        if engine in RHO:
+            return exact(self.model, fulltime, RHO[engine])
+        if engine == Engine.numpy:
+            from .batch import simulate
+
+            aggregate = simulate(
+                self.model, fulltime, steps, self.numpy_seed(), antithetic
+            )
+            _count(aggregate)
+            return aggregate
+
+        aggregate = self.model.new_aggregate(fulltime)
+        for _ in range(steps):
+            aggregate.add(self.play(fulltime, engine))
+        _count(aggregate)
+        return aggregate
+
+    def play_100(
+        self,
+        fulltime: int = 90,
+        steps: int = 100,
+        engine: Engine = Engine.python,
+        antithetic: bool = False,
+    ) -> Result:
+        return self.simulate(fulltime, steps, engine, antithetic).mean()
+
+    def distribution(
+        self,
+        fulltime: int = 90,
+        steps: int = 100,
+        engine: Engine = Engine.python,
+        antithetic: bool = False,
+    ) -> Distribution:
+        return self.simulate(
+            fulltime, steps, engine, antithetic
+        ).distribution()
+
+    def compare(
+        self,
+        other: MatchTypes | MatchModel,
+        fulltime: int = 90,
+        steps: int = 100,
+        antithetic: bool = False,
+    ) -> Comparison:
+        """用同一组随机数模拟当前比赛和另一种情形 (例如调整了 xg),
+        两者之差的噪声远小于分别模拟"""
+        from .batch import compare
+
+        if not isinstance(other, MatchModel):
+            other = MatchModel.from_match(other)
+        comparison = compare(
+            self.model, other, fulltime, steps, self.numpy_seed(), antithetic
         )
-        return result / steps
+        _count(comparison.base)
+        _count(comparison.other)
+        return comparison
+
+    def play_from(
+        self,
+        minute: int,
+        home_score: int = 0,
+        away_score: int = 0,
+        fulltime: int = 90,
+    ) -> Distribution:
+        """从比赛进行到 minute 分钟, 比分为 home_score : away_score 时开始,
+        由缓存的剩余时间进球分布直接得到全场的比分分布"""
+        if not 0 <= minute <= fulltime:
+            raise ValueError(f"minute must be between 0 and {fulltime}")
+        if home_score < 0 or away_score < 0:
+            raise ValueError("score must not be negative")
+
+        home_goal_prob, away_goal_prob = goal_probs(self.model)
+        minutes = fulltime - minute
+        tail = tail_scorelines(home_goal_prob, away_goal_prob, minutes)
+        scorelines = [[0.0] * (MAX_GOALS + 1) for _ in range(MAX_GOALS + 1)]
+        for home, row in enumerate(tail):
+            for away, prob in enumerate(row):
+                final_home = min(home + home_score, MAX_GOALS)
+                final_away = min(away + away_score, MAX_GOALS)
+                scorelines[final_home][final_away] += prob
+
+        return Distribution(
+            home=self.model.home_name,
+            away=self.model.away_name,
+            competition=self.model.competition,
+            scorelines=scorelines,
+            home_goals=home_score + minutes * home_goal_prob,
+            away_goals=away_score + minutes * away_goal_prob,
+        )
+
+
+def _count(aggregate: Aggregate) -> None:
+    metrics.count("simulations", aggregate.steps)
+    metrics.count("minutes", aggregate.steps * aggregate.timing)
+    metrics.count("shots", int(aggregate.home.shots + aggregate.away.shots))
+
+
+def _simulate_chunk(
+    model: MatchModel,
+    fulltime: int,
+    steps: int,
+    engine: Engine,
+    seed: int,
+    antithetic: bool = False,
+) -> Aggregate:
+    return Game(model, seed).simulate(fulltime, steps, engine, antithetic)
+
+
+def simulate_many(
+    matches: list[MatchTypes],
+    steps: int = 100,
+    workers: int = 1,
+    fulltime: int = 90,
+    engine: Engine = Engine.python,
+    seed: int | None = None,
+    target_se: float | None = None,
+    models: list[MatchModel] | None = None,
+    cache: ResultCache | None = None,
+    antithetic: bool = False,
+) -> list[Aggregate]:
+    """与 simulate_iter 相同, 按 matches 的顺序返回全部结果"""
+    results = dict(
+        simulate_iter(
+            matches,
+            steps,
+            workers,
+            fulltime,
+            engine,
+            seed,
+            target_se,
+            models,
+            cache,
+            antithetic=antithetic,
+        )
+    )
+    return [results[index] for index in range(len(matches))]
+
+
+def simulate_iter(
+    matches: list[MatchTypes],
+    steps: int = 100,
+    workers: int = 1,
+    fulltime: int = 90,
+    engine: Engine = Engine.python,
+    seed: int | None = None,
+    target_se: float | None = None,
+    models: list[MatchModel] | None = None,
+    cache: ResultCache | None = None,
+    executor: "Executor | None" = None,
+    antithetic: bool = False,
+) -> Iterator[tuple[int, Aggregate]]:
+    """把每场比赛的 steps 按 STEPS_PER_CHUNK 切块分配到进程池, 再合并各块的结果.
+    每块使用由 seed, 比赛和块序号派生的独立种子, 所以结果与 workers 无关.
+    每场比赛完成时立即产出 (比赛在 matches 中的序号, 结果).
+
+    给定 target_se 时 steps 为上限, 每场比赛逐块累加, 直到胜平负概率的标准误
+    都不超过 target_se 为止.
+
+    models 为已经由 matches 生成的 MatchModel, 常驻进程中可以复用.
+    给定 seed 时结果是确定的, 可以从 cache 中读取或保存到 cache.
+    新的结果全部写入 cache 后 (或迭代提前结束时) 才淘汰一次旧结果.
+    传入 executor 时使用它而不是新建进程池, 由调用者负责关闭.
+    解析引擎每场比赛只需要几微秒, 直接在当前进程中计算, 不使用缓存.
+    antithetic 为 True 时每块内使用对偶随机数, 只支持 numpy 引擎"""
+    if antithetic and engine != Engine.numpy:
+        raise ValueError("antithetic variates need the numpy engine")
+    if engine in RHO:
+        for index, match in enumerate(matches):
+            model = (
+                models[index]
+                if models is not None
+                else MatchModel.from_match(match)
+            )
+            with metrics.phase("simulate"):
+                aggregate = exact(model, fulltime, RHO[engine])
+            yield index, aggregate
+        return
+    if seed is None:
+        seed = entropy()
+        cache = None
+    if models is None:
+        models = [MatchModel.from_match(match) for match in matches]
+    match_seeds = [
+        spawn(seed, match["name"], match["utc_time"]) for match in matches
+    ]
+    sizes = [
+        min(STEPS_PER_CHUNK, steps - start)
+        for start in range(0, steps, STEPS_PER_CHUNK)
+    ]
+    totals = [model.new_aggregate(fulltime) for model in models]
+    # 每场比赛下一个要合并的块
+    cursors = [0] * len(models)
+    keys = []
+    if cache is not None and sizes:
+        keys = [
+            cache.key(
+                match,
+                fulltime,
+                steps,
+                engine,
+                match_seed,
+                target_se,
+                antithetic,
+            )
+            for match, match_seed in zip(matches, match_seeds)
+        ]
+        for index, key in enumerate(keys):
+            if (cached := cache.get(key)) is not None:
+                totals[index] = cached
+                cursors[index] = len(sizes)
+                metrics.count("results.hit")
+            else:
+                metrics.count("results.miss")
+    pending = [
+        index for index in range(len(models)) if cursors[index] < len(sizes)
+    ]
+    for index in range(len(models)):
+        if cursors[index] == len(sizes):
+            yield index, totals[index]
+
+    stored = False
+    owner = executor is None and workers > 1 and bool(pending)
+    if owner:
+        from concurrent.futures import ProcessPoolExecutor
+
+        executor = ProcessPoolExecutor(max_workers=workers)
+    try:
+        while pending:
+            if target_se is None:
+                per_match = len(sizes)
+            else:
+                # 多算的块在收敛后丢弃, 保证结果与 workers 无关
+                per_match = max(1, workers // len(pending))
+            tasks = [
+                (index, chunk)
+                for index in pending
+                for chunk in range(
+                    cursors[index], min(cursors[index] + per_match, len(sizes))
+                )
+            ]
+            args = (
+                [models[index] for index, _ in tasks],
+                [fulltime] * len(tasks),
+                [sizes[chunk] for _, chunk in tasks],
+                [engine] * len(tasks),
+                [spawn(match_seeds[index], chunk) for index, chunk in tasks],
+                [antithetic] * len(tasks),
+            )
+            # map 按 tasks 的顺序逐个返回结果, 每场比赛合并完即可产出
+            partials: Iterator[Aggregate]
+            if executor is None:
+                partials = map(_simulate_chunk, *args)
+            else:
+                partials = executor.map(_simulate_chunk, *args)
+
+            for index, chunk in tasks:
+                with metrics.phase("simulate"):
+                    partial = next(partials)
+                if executor is not None:
+                    # 子进程中的计数不会传回, 在这里按结果补上
+                    _count(partial)
+                if chunk != cursors[index]:
+                    continue
+                totals[index] += partial
+                cursors[index] += 1
+                if target_se is not None and (
+                    totals[index].distribution().max_standard_error
+                    <= target_se
+                ):
+                    cursors[index] = len(sizes)
+                if cursors[index] == len(sizes):
+                    if cache is not None and keys:
+                        cache.put(keys[index], totals[index])
+                        stored = True
+                    yield index, totals[index]
+            pending = [
+                index for index in pending if cursors[index] < len(sizes)
+            ]
+    finally:
+        if owner and executor is not None:
+            executor.shutdown(cancel_futures=True)
+        if cache is not None and stored:
+            cache.evict()
+
+
+def simulate_dates(
+    dated: Iterable[tuple[str, list[MatchTypes]]],
+    steps: int = 100,
+    workers: int = 1,
+    fulltime: int = 90,
+    engine: Engine = Engine.python,
+    seed: int | None = None,
+    target_se: float | None = None,
+    cache: ResultCache | None = None,
+    batch_size: int = 100,
+    antithetic: bool = False,
+) -> Iterator[tuple[str, MatchTypes, Aggregate]]:
+    """依次取出 dated 中的比赛, 凑够 batch_size 场后一起交给 simulate_iter,
+    所有批次共用一个进程池. 每场比赛完成时产出 (日期, 比赛, 结果).
+    每场比赛的种子只由 seed 和比赛决定, 与单独模拟某一天的结果相同"""
+    if seed is None:
+        seed = entropy()
+        cache = None
+
+    executor = None
+    if workers > 1:
+        from concurrent.futures import ProcessPoolExecutor
+
+        executor = ProcessPoolExecutor(max_workers=workers)
+
+    def run(
+        batch: list[tuple[str, MatchTypes]],
+    ) -> Iterator[tuple[str, MatchTypes, Aggregate]]:
+        for index, aggregate in simulate_iter(
+            [match for _, match in batch],
+            steps,
+            workers,
+            fulltime,
+            engine,
+            seed,
+            target_se,
+            cache=cache,
+            executor=executor,
+            antithetic=antithetic,
+        ):
+            date, match = batch[index]
+            yield date, match, aggregate
+
+    try:
+        batch: list[tuple[str, MatchTypes]] = []
+        for date, matches in dated:
+            batch += [(date, match) for match in matches]
+            if len(batch) >= batch_size:
+                yield from run(batch)
+                batch = []
+        if batch:
+            yield from run(batch)
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
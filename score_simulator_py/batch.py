@@ -0,0 +1,311 @@
+from collections.abc import Iterator
+from typing import Any
+
+import numpy as np
+import numpy.typing as npt
+
+from .models import (
+    MAX_GOALS,
+    Aggregate,
+    Comparison,
+    Distribution,
+    MatchModel,
+    TeamAggregate,
+)
+
+# 每批最多模拟的场次, 控制 N x fulltime 矩阵的内存占用
+CHUNK_SIZE = 10_000
+
+
+def simulate(
+    model: MatchModel,
+    fulltime: int = 90,
+    steps: int = 100,
+    seed: int | None = None,
+    antithetic: bool = False,
+) -> Aggregate:
+    """一次性生成 steps x fulltime 的随机矩阵, 把 steps 场比赛累加到 Aggregate.
+    antithetic 为 True 时每批后一半比赛使用前一半的对偶随机数 1 - u"""
+    return simulate_common([model], fulltime, steps, seed, antithetic)[0]
+
+
+def simulate_common(
+    models: list[MatchModel],
+    fulltime: int = 90,
+    steps: int = 100,
+    seed: int | None = None,
+    antithetic: bool = False,
+) -> list[Aggregate]:
+    """所有 models 使用同一组均匀随机数 (common random numbers),
+    结果之间的差异只来自参数不同, 而不是抽样噪声"""
+    accumulators = [
+        _Accumulator(model, fulltime, antithetic) for model in models
+    ]
+    for _ in _chunks(accumulators, steps, seed, antithetic):
+        pass
+    return [accumulator.finish() for accumulator in accumulators]
+
+
+def compare(
+    base: MatchModel,
+    other: MatchModel,
+    fulltime: int = 90,
+    steps: int = 100,
+    seed: int | None = None,
+    antithetic: bool = False,
+) -> Comparison:
+    """用同一组随机数模拟 base 和 other 两种情形, 同时记录逐场的差值,
+    用于估计差值的标准误"""
+    accumulators = [
+        _Accumulator(base, fulltime, antithetic),
+        _Accumulator(other, fulltime, antithetic),
+    ]
+    units = 0
+    diff_sum = np.zeros(3)
+    diff_sq = np.zeros(3)
+    for base_outcomes, other_outcomes in _chunks(
+        accumulators, steps, seed, antithetic
+    ):
+        diff = other_outcomes - base_outcomes
+        if antithetic:
+            diff = _pair_sums(diff) / 2
+        units += diff.shape[1]
+        diff_sum += diff.sum(axis=1)
+        diff_sq += (diff**2).sum(axis=1)
+    return Comparison(
+        base=accumulators[0].finish(),
+        other=accumulators[1].finish(),
+        units=units,
+        diff_sum=diff_sum.tolist(),
+        diff_sq=diff_sq.tolist(),
+    )
+
+
+def sweep(
+    models: list[MatchModel],
+    fulltime: int = 90,
+    steps: int = 10_000,
+    seed: int | None = None,
+) -> list[Distribution]:
+    """只计算比分的 simulate_common, 用于大量参数组合.
+    主队进球只取决于每分钟射门概率, 主队射门占比和主队每次射门的 xg,
+    客队同理, 所以射门矩阵按前两者分组只计算一次, 进球数按 xg 只计算一次"""
+    rng = np.random.default_rng(seed)
+    cells = (MAX_GOALS + 1) ** 2
+    scorelines = np.zeros((len(models), cells), dtype=np.int64)
+    # 每个组合主客队进球数的和与平方和
+    goals = np.zeros((len(models), 2), dtype=np.int64)
+    goals_sq = np.zeros((len(models), 2), dtype=np.int64)
+    groups: dict[tuple[float, float], list[int]] = {}
+    for index, model in enumerate(models):
+        key = (model.shot_prob_per_minute, model.home_shot_percentage)
+        groups.setdefault(key, []).append(index)
+
+    for start in range(0, steps, CHUNK_SIZE):
+        size = (min(CHUNK_SIZE, steps - start), fulltime)
+        shot_u = rng.random(size, dtype=np.float32)
+        home_u = rng.random(size, dtype=np.float32)
+        score_u = rng.random(size, dtype=np.float32)
+        for (shot_prob, home_percentage), indexes in groups.items():
+            shot = shot_u < shot_prob
+            home = home_u < home_percentage
+            home_shot = shot & home
+            away_shot = shot & ~home
+            home_goals: dict[float, npt.NDArray[Any]] = {}
+            away_goals: dict[float, npt.NDArray[Any]] = {}
+            for index in indexes:
+                model = models[index]
+                home_xg, away_xg = (
+                    model.home_xg_per_shot,
+                    model.away_xg_per_shot,
+                )
+                if home_xg not in home_goals:
+                    home_goals[home_xg] = np.count_nonzero(
+                        home_shot & (score_u < home_xg), axis=1
+                    )
+                if away_xg not in away_goals:
+                    away_goals[away_xg] = np.count_nonzero(
+                        away_shot & (score_u < away_xg), axis=1
+                    )
+                home_scores = home_goals[home_xg]
+                away_scores = away_goals[away_xg]
+                scorelines[index] += np.bincount(
+                    np.minimum(home_scores, MAX_GOALS) * (MAX_GOALS + 1)
+                    + np.minimum(away_scores, MAX_GOALS),
+                    minlength=cells,
+                )
+                goals[index] += home_scores.sum(), away_scores.sum()
+                goals_sq[index] += (
+                    np.dot(home_scores, home_scores),
+                    np.dot(away_scores, away_scores),
+                )
+
+    distributions = []
+    for index, model in enumerate(models):
+        mean = goals[index] / steps
+        variance = (goals_sq[index] - goals[index] * mean) / max(steps - 1, 1)
+        se = np.sqrt(np.maximum(variance, 0) / steps)
+        distributions.append(
+            Distribution(
+                home=model.home_name,
+                away=model.away_name,
+                competition=model.competition,
+                scorelines=(scorelines[index] / steps)
+                .reshape(MAX_GOALS + 1, -1)
+                .tolist(),
+                home_goals=float(mean[0]),
+                away_goals=float(mean[1]),
+                home_goals_se=float(se[0]),
+                away_goals_se=float(se[1]),
+                steps=steps,
+            )
+        )
+    return distributions
+
+
+def _chunks(
+    accumulators: list["_Accumulator"],
+    steps: int,
+    seed: int | None,
+    antithetic: bool,
+) -> Iterator[list[npt.NDArray[Any]]]:
+    """分批生成随机数交给每个 accumulator, 产出每批各自的胜平负矩阵"""
+    rng = np.random.default_rng(seed)
+    fulltime = accumulators[0].fulltime if accumulators else 0
+    for start in range(0, steps, CHUNK_SIZE):
+        size = (min(CHUNK_SIZE, steps - start), fulltime)
+        shot = _uniform(rng, size, antithetic)
+        home = _uniform(rng, size, antithetic)
+        u = _uniform(rng, size, antithetic)
+        yield [
+            accumulator.add(rng, shot, home, u) for accumulator in accumulators
+        ]
+
+
+def _uniform(
+    rng: np.random.Generator, size: tuple[int, int], antithetic: bool
+) -> npt.NDArray[Any]:
+    if not antithetic:
+        return rng.random(size, dtype=np.float32)
+    half = rng.random(((size[0] + 1) // 2, size[1]), dtype=np.float32)
+    return np.concatenate([half, 1 - half])[: size[0]]
+
+
+def _pair_sums(values: npt.NDArray[Any]) -> npt.NDArray[Any]:
+    """对偶抽样时第 i 场与第 half + i 场成对, 场次为奇数时最后一场不成对"""
+    n = values.shape[1]
+    half = (n + 1) // 2
+    sums: npt.NDArray[Any] = (
+        values[:, : n // 2] + values[:, half : half + n // 2]
+    )
+    return sums
+
+
+class _Accumulator:
+    """把一个 MatchModel 的各批结果累加起来, 计数先保存在 numpy 数组中"""
+
+    def __init__(
+        self, model: MatchModel, fulltime: int, antithetic: bool
+    ) -> None:
+        self.model = model
+        self.fulltime = fulltime
+        self.antithetic = antithetic
+        self.aggregate = model.new_aggregate(fulltime)
+        self.home_goal_counts = np.zeros(fulltime, dtype=np.int64)
+        self.away_goal_counts = np.zeros(fulltime, dtype=np.int64)
+        self.scorelines = np.zeros((MAX_GOALS + 1) ** 2, dtype=np.int64)
+        self.pair_sq = np.zeros(3, dtype=np.int64)
+
+    def add(
+        self,
+        rng: np.random.Generator,
+        shot_u: npt.NDArray[Any],
+        home_u: npt.NDArray[Any],
+        score_u: npt.NDArray[Any],
+    ) -> npt.NDArray[Any]:
+        """累加一批比赛, 返回形状为 (3, 场次) 的主胜/平局/客胜 0-1 矩阵"""
+        model = self.model
+        aggregate = self.aggregate
+        steps = shot_u.shape[0]
+        shot = shot_u < model.shot_prob_per_minute
+        home = home_u < model.home_shot_percentage
+
+        home_shot = shot & home
+        away_shot = shot & ~home
+        home_score = home_shot & (score_u < model.home_xg_per_shot)
+        away_score = away_shot & (score_u < model.away_xg_per_shot)
+
+        home_shots = home_shot.sum(axis=1, dtype=np.int64)
+        away_shots = away_shot.sum(axis=1, dtype=np.int64)
+        home_shots_total = int(home_shots.sum())
+
+        # 与 Game.generate_xg 相同的截断正态分布, 只为射门生成
+        mu = np.repeat(
+            [model.home_xg_per_shot, model.away_xg_per_shot],
+            [home_shots_total, int(away_shots.sum())],
+        )
+        xg = mu + 0.1 * rng.standard_normal(mu.size)
+        xg = np.where(xg <= 0, 0.01, np.where(xg > 1, 0.99, xg))
+
+        rows = np.arange(steps)
+        home_xg = np.bincount(
+            np.repeat(rows, home_shots),
+            weights=xg[:home_shots_total],
+            minlength=steps,
+        )
+        away_xg = np.bincount(
+            np.repeat(rows, away_shots),
+            weights=xg[home_shots_total:],
+            minlength=steps,
+        )
+
+        home_scores = home_score.sum(axis=1, dtype=np.int64)
+        away_scores = away_score.sum(axis=1, dtype=np.int64)
+        self.scorelines += np.bincount(
+            np.minimum(home_scores, MAX_GOALS) * (MAX_GOALS + 1)
+            + np.minimum(away_scores, MAX_GOALS),
+            minlength=self.scorelines.size,
+        )
+
+        _fold(aggregate.home, home_shots, home_scores, home_xg)
+        _fold(aggregate.away, away_shots, away_scores, away_xg)
+        self.home_goal_counts += home_score.sum(axis=0, dtype=np.int64)
+        self.away_goal_counts += away_score.sum(axis=0, dtype=np.int64)
+        aggregate.steps += steps
+
+        outcomes = np.stack(
+            [
+                home_scores > away_scores,
+                home_scores == away_scores,
+                home_scores < away_scores,
+            ]
+        ).astype(np.int64)
+        if self.antithetic:
+            pairs = _pair_sums(outcomes)
+            self.pair_sq += (pairs**2).sum(axis=1)
+            aggregate.pairs += pairs.shape[1]
+        return outcomes
+
+    def finish(self) -> Aggregate:
+        aggregate = self.aggregate
+        aggregate.home.goal_counts = self.home_goal_counts.tolist()
+        aggregate.away.goal_counts = self.away_goal_counts.tolist()
+        matrix: npt.NDArray[Any] = self.scorelines.reshape(MAX_GOALS + 1, -1)
+        aggregate.scorelines = matrix.tolist()
+        if self.antithetic:
+            aggregate.pair_sq = self.pair_sq.tolist()
+        return aggregate
+
+
+def _fold(
+    team: TeamAggregate,
+    shots: npt.NDArray[Any],
+    scores: npt.NDArray[Any],
+    xg: npt.NDArray[Any],
+) -> None:
+    team.shots += int(shots.sum())
+    team.score += int(scores.sum())
+    team.xg += float(xg.sum())
+    team.shots_sq += int(np.dot(shots, shots))
+    team.score_sq += int(np.dot(scores, scores))
+    team.xg_sq += float(np.dot(xg, xg))
@@ -0,0 +1,163 @@
+import platform
+import tempfile
+import time
+import tracemalloc
+from datetime import date as datelib
+from datetime import timedelta
+from typing import Any, Callable
+
+from .analytic import RHO
+from .api import Game, Matches
+from .models import Result, ResultTeam
+from .types import BenchTypes, Engine, MatchesTypes, MatchTypes
+
+BENCH_MATCH: MatchTypes = {
+    "name": "Juventus vs Napoli",
+    "utc_time": "2023-12-08T19:45:00.000Z",
+    "finished": True,
+    "competition": {"name": "Serie A", "logo": ""},
+    "home": {
+        "name": "Juventus",
+        "logo": "",
+        "shots": 195,
+        "xg": 22.7,
+        "score": 1,
+        "played": 15,
+    },
+    "away": {
+        "name": "Napoli",
+        "logo": "",
+        "shots": 242,
+        "xg": 25.6,
+        "score": 0,
+        "played": 15,
+    },
+}
+
+
+def measure(
+    name: str,
+    func: Callable[[], Any],
+    sims: int = 0,
+    minutes: int = 0,
+) -> BenchTypes:
+    """先在 tracemalloc 下运行一次得到内存峰值 (同时完成预热), 再单独计时,
+    避免 tracemalloc 的开销计入耗时"""
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    start = time.perf_counter()
+    func()
+    seconds = time.perf_counter() - start
+
+    return {
+        "name": name,
+        "seconds": seconds,
+        "sims_per_sec": sims / seconds if sims else None,
+        "ns_per_minute": seconds / minutes * 1e9 if minutes else None,
+        "peak_bytes": peak,
+    }
+
+
+def repeat(func: Callable[[], Any], n: int) -> Callable[[], None]:
+    def run() -> None:
+        for _ in range(n):
+            func()
+
+    return run
+
+
+def synthetic_matches(seasons: int, per_day: int = 10) -> MatchesTypes:
+    """seasons 个赛季, 每天 per_day 场比赛的模拟数据"""
+    start = datelib(2000, 1, 1)
+    return {
+        (start + timedelta(days=day)).strftime("%Y-%m-%d"): [BENCH_MATCH]
+        * per_day
+        for day in range(seasons * 365)
+    }
+
+
+def run(
+    steps: list[int],
+    engines: list[Engine],
+    seasons: int = 3,
+    calls: int = 1000,
+) -> list[BenchTypes]:
+    """calls 为 attack / play / __add__ 的重复次数"""
+    game = Game(BENCH_MATCH, seed=0)
+    results = [
+        measure(
+            "Game.attack",
+            repeat(game.attack, 90 * calls),
+            minutes=90 * calls,
+        ),
+        measure(
+            "Game.play",
+            repeat(game.play, calls),
+            sims=calls,
+            minutes=90 * calls,
+        ),
+    ]
+    for engine in engines:
+        if engine in RHO:
+            # 解析引擎与 steps 无关
+            results.append(
+                measure(
+                    f"Game.play_100[{engine.value}]",
+                    lambda: game.play_100(engine=engine),
+                )
+            )
+            continue
+        for step in steps:
+            results.append(
+                measure(
+                    f"Game.play_100[{engine.value}, steps={step}]",
+                    lambda: game.play_100(steps=step, engine=engine),
+                    sims=step,
+                    minutes=90 * step,
+                )
+            )
+
+    result = game.play()
+    results.append(
+        measure(
+            "Result.__add__",
+            lambda: sum((result for _ in range(calls)), result),
+            sims=calls,
+        )
+    )
+    minutes = [minute % 90 for minute in range(150)]
+    total = Result(
+        home=ResultTeam("Juventus", score=150, goal_minutes=minutes),
+        away=ResultTeam("Napoli", score=120, goal_minutes=minutes),
+        competition="Serie A",
+    )
+    results.append(measure("Result._divide", lambda: total._divide(100)))
+
+    with tempfile.TemporaryDirectory() as directory:
+        matches = Matches()
+        matches.path = directory
+        data = synthetic_matches(seasons)
+        matches.save(data)
+        date = list(data)[len(data) // 2]
+        results += [
+            measure(f"Matches.read[seasons={seasons}]", matches.read),
+            measure(
+                f"Matches.select[seasons={seasons}]",
+                lambda: matches.select(date),
+            ),
+        ]
+    return results
+
+
+def environment() -> dict[str, str]:
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "processor": platform.processor(),
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+    }
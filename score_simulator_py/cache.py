@@ -0,0 +1,104 @@
+import hashlib
+import json
+import os
+from dataclasses import asdict
+from pathlib import Path
+from typing import Any
+
+from .files import atomic_write
+from .models import Aggregate, TeamAggregate
+from .settings import CACHE_SIZE
+from .types import Engine, MatchTypes
+
+
+def dump(aggregate: Aggregate) -> str:
+    return json.dumps(asdict(aggregate), separators=(",", ":"))
+
+
+def load(text: str) -> Aggregate:
+    data: dict[str, Any] = json.loads(text)
+    return Aggregate(
+        home=TeamAggregate(**data["home"]),
+        away=TeamAggregate(**data["away"]),
+        competition=data["competition"],
+        timing=data["timing"],
+        steps=data["steps"],
+        scorelines=data["scorelines"],
+        exact=data.get("exact", False),
+        pairs=data.get("pairs", 0),
+        pair_sq=data.get("pair_sq", [0, 0, 0]),
+    )
+
+
+class ResultCache:
+    """保存在数据目录下的模拟结果, 以比赛参数和模拟参数的哈希为键.
+    比赛数据变化后键随之改变, 旧结果不再命中, 最终按 LRU 淘汰.
+    读取时更新文件的 mtime, evict 时删除最久未使用的结果直到总大小不超过 max_size.
+    evict 需要列出整个目录, 所以 put 不会调用, 由调用者在一批 put 之后调用一次"""
+
+    def __init__(self, directory: Path, max_size: int = CACHE_SIZE) -> None:
+        self.directory = directory
+        self.max_size = max_size
+
+    @staticmethod
+    def key(
+        match: MatchTypes,
+        fulltime: int,
+        steps: int,
+        engine: Engine,
+        seed: int,
+        target_se: float | None = None,
+        antithetic: bool = False,
+    ) -> str:
+        params = [
+            match["competition"]["name"],
+            [
+                [team["name"], team["shots"], team["xg"], team["played"]]
+                for team in (match["home"], match["away"])
+            ],
+            fulltime,
+            steps,
+            engine.value,
+            seed,
+            target_se,
+        ]
+        if antithetic:
+            # 只在使用时加入, 原有结果的键保持不变
+            params.append("antithetic")
+        return hashlib.sha256(json.dumps(params).encode()).hexdigest()
+
+    def file(self, key: str) -> Path:
+        return Path(self.directory, f"{key}.json")
+
+    def get(self, key: str) -> Aggregate | None:
+        file = self.file(key)
+        try:
+            aggregate = load(file.read_text())
+            os.utime(file)
+        except (OSError, ValueError, KeyError, TypeError):
+            # 不存在或已损坏的结果都视为未命中
+            return None
+        return aggregate
+
+    def put(self, key: str, aggregate: Aggregate) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        atomic_write(self.file(key), dump(aggregate))
+
+    def evict(self) -> None:
+        entries = []
+        for file in self.directory.glob("*.json"):
+            try:
+                stat = file.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime_ns, stat.st_size, file))
+        total = sum(size for _, size, _ in entries)
+        for _, size, file in sorted(entries):
+            if total <= self.max_size:
+                break
+            file.unlink(missing_ok=True)
+            total -= size
+
+    def clear(self) -> None:
+        for file in self.directory.glob("*.json"):
+            file.unlink(missing_ok=True)
@@ -1,55 +1,547 @@
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
 from datetime import date as datelib
-from typing import Optional
+from pathlib import Path
+from typing import IO, TYPE_CHECKING, Any, Optional
 
 import typer
 
-from .api import Game, Matches
+from .types import Engine, Format, MatchTypes, SweepTypes
+
+if TYPE_CHECKING:
+    from .api import AsyncMatches, BaseMatches
+    from .models import Aggregate, Distribution
 
 app = typer.Typer()
 
 
+def sync() -> "AsyncMatches":
+    """在 asyncio.run 中更新本地数据, httpx 等只在这里才导入"""
+    import asyncio
+
+    from . import metrics
+    from .api import AsyncMatches
+
+    async def run(matches: AsyncMatches) -> None:
+        async with matches:
+            await matches.sync()
+
+    matches = AsyncMatches()
+    with metrics.phase("sync"):
+        asyncio.run(run(matches))
+    return matches
+
+
+@contextmanager
+def profiled(profile: bool, output: Optional[Path]) -> Iterator[None]:
+    """--profile 时把各阶段耗时和计数打印到 stderr,
+    --profile-output 时另外写为 JSON"""
+    if not profile and output is None:
+        yield
+        return
+    import json
+    import sys
+
+    from . import metrics
+
+    with metrics.profiling() as summary:
+        yield
+    if profile:
+        print(summary.report(), file=sys.stderr)
+    if output is not None:
+        output.write_text(json.dumps(summary.summary(), indent=2))
+
+
 @app.command()
 def version() -> None:
     print("0.1.0")
 
 
+FROM = typer.Option(None, "--from")
+TO = typer.Option(None, "--to")
+
+
 @app.command()
-def play(date: Optional[str] = None) -> None:
+def play(
+    date: Optional[list[str]] = None,
+    from_: Optional[str] = FROM,
+    to: Optional[str] = TO,
+    fulltime: int = 90,
+    engine: Engine = Engine.python,
+    workers: int = 1,
+    seed: Optional[int] = None,
+    profile: bool = False,
+    profile_output: Optional[Path] = None,
+    cache: bool = True,
+    format: Format = Format.text,
+    output: Optional[Path] = None,
+) -> None:
+    from .analytic import RHO
+    from .api import simulate_dates
+
+    if engine in RHO:
+        raise typer.BadParameter(
+            f"--engine={engine.value} cannot play a match, use play_100"
+        )
+    with profiled(profile, profile_output):
+        matches = sync()
+        results = simulate_dates(
+            select(matches, date, from_, to),
+            1,
+            workers,
+            fulltime,
+            engine,
+            seed,
+            cache=matches.results if cache else None,
+        )
+        emit(results, format, output, header=is_multi(date, from_, to))
+
+
+@app.command(name="play_100")
+def play_100(
+    date: Optional[list[str]] = None,
+    from_: Optional[str] = FROM,
+    to: Optional[str] = TO,
+    fulltime: int = 90,
+    steps: int = 100,
+    engine: Engine = Engine.python,
+    workers: int = 1,
+    seed: Optional[int] = None,
+    distribution: bool = False,
+    target_se: Optional[float] = None,
+    antithetic: bool = False,
+    profile: bool = False,
+    profile_output: Optional[Path] = None,
+    cache: bool = True,
+    format: Format = Format.text,
+    output: Optional[Path] = None,
+) -> None:
+    from .api import simulate_dates
+
+    if antithetic and engine != Engine.numpy:
+        raise typer.BadParameter("--antithetic needs --engine=numpy")
+    with profiled(profile, profile_output):
+        matches = sync()
+        results = simulate_dates(
+            select(matches, date, from_, to),
+            steps,
+            workers,
+            fulltime,
+            engine,
+            seed,
+            target_se,
+            cache=matches.results if cache else None,
+            antithetic=antithetic,
+        )
+        emit(
+            results,
+            format,
+            output,
+            target_se is not None or antithetic,
+            distribution,
+            header=is_multi(date, from_, to),
+        )
+
+
+def select(
+    matches: "BaseMatches",
+    dates: Optional[list[str]],
+    start: Optional[str],
+    end: Optional[str],
+) -> Iterator[tuple[str, list[MatchTypes]]]:
+    """--date 可以重复多次, 也可以用 --from/--to 选择一段日期,
+    都没有时为今天"""
+    if start is not None or end is not None:
+        if dates:
+            raise typer.BadParameter("--date cannot be used with --from/--to")
+        return matches.select_dates(start=start, end=end)
+    if not dates:
+        dates = [datelib.today().strftime("%Y-%m-%d")]
+    return matches.select_dates(dates)
+
+
+def is_multi(
+    dates: Optional[list[str]], start: Optional[str], end: Optional[str]
+) -> bool:
+    return start is not None or end is not None or len(dates or []) > 1
+
+
+def emit(
+    results: Iterable[tuple[str, MatchTypes, "Aggregate"]],
+    format: Format,
+    output: Optional[Path],
+    steps: bool = False,
+    distribution: bool = False,
+    header: bool = False,
+) -> None:
+    """每场比赛模拟完成后立即写出, 不在内存中收集全部结果.
+    写到 stdout 时逐条刷新, 写到 --output 文件时使用缓冲写入.
+    header 为 True 时文本格式在每个日期前输出日期"""
+    import sys
+
+    from . import metrics
+    from .output import record, writer
+
+    file = sys.stdout if output is None else open(output, "w")
+    try:
+        out = None
+        if format != Format.text:
+            out = writer(format, file, flush=output is None)
+        last = None
+        for date, _, aggregate in results:
+            with metrics.phase("output"):
+                if out is not None:
+                    out.write(record(aggregate, date))
+                    continue
+                if header and date != last:
+                    print(date, file=file)
+                    last = date
+                print_result(aggregate, file, steps, distribution)
+                if output is None:
+                    file.flush()
+        if out is not None:
+            out.close()
+    finally:
+        if output is not None:
+            file.close()
+
+
+def print_result(
+    aggregate: "Aggregate",
+    file: Optional[IO[str]] = None,
+    steps: bool = False,
+    distribution: bool = False,
+) -> None:
+    result = aggregate.mean()
+    print(
+        (
+            f"{result.competition} - "
+            f"{result.home.name} {result.home.score} : "
+            f"{result.away.score} {result.away.name}"
+        ),
+        file=file,
+    )
+    if steps and aggregate.exact:
+        print("  exact", file=file)
+    elif steps:
+        result_distribution = aggregate.distribution()
+        line = (
+            f"  {aggregate.steps} steps, "
+            f"±{result_distribution.max_standard_error:.2%}"
+        )
+        if result_distribution.variance_reduction is not None:
+            line += (
+                ", variance reduction "
+                f"x{result_distribution.variance_reduction:.2f}"
+            )
+        print(line, file=file)
+    if distribution:
+        print_distribution(aggregate.distribution(), file)
+
+
+@app.command(name="play_from")
+def play_from(
+    minute: int,
+    home_score: int = 0,
+    away_score: int = 0,
+    date: Optional[str] = None,
+    name: Optional[str] = None,
+    fulltime: int = 90,
+    profile: bool = False,
+    profile_output: Optional[Path] = None,
+) -> None:
     if date is None:
         date = datelib.today().strftime("%Y-%m-%d")
-    matches = Matches()
-    data = matches.get()
-    for match in matches.select(date, data):
-        game = Game(match)
-        result = game.play()
+    from .api import Game
 
-        print(
-            (
-                f"{result.competition} - "
-                f"{result.home.name} {result.home.score} : "
-                f"{result.away.score} {result.away.name}"
+    with profiled(profile, profile_output):
+        matches = sync()
+        for match in matches.select(date):
+            if name is not None and match["name"] != name:
+                continue
+            distribution = Game(match).play_from(
+                minute, home_score, away_score, fulltime
+            )
+            print(
+                (
+                    f"{distribution.competition} - "
+                    f"{distribution.home} {home_score} : "
+                    f"{away_score} {distribution.away} ({minute}')"
+                )
             )
+            print_distribution(distribution)
+
+
+@app.command()
+def compare(
+    name: str,
+    date: Optional[str] = None,
+    home_shots: float = 1,
+    home_xg: float = 1,
+    home_played: float = 1,
+    away_shots: float = 1,
+    away_xg: float = 1,
+    away_played: float = 1,
+    fulltime: int = 90,
+    steps: int = 10_000,
+    seed: Optional[int] = None,
+    antithetic: bool = False,
+) -> None:
+    """比较一场比赛与按系数调整后的情形, 例如 --home-xg=1.1,
+    两者使用同一组随机数"""
+    if date is None:
+        date = datelib.today().strftime("%Y-%m-%d")
+    from .api import Game
+    from .models import MatchModel
+
+    factors = {
+        "home_shots": home_shots,
+        "home_xg": home_xg,
+        "home_played": home_played,
+        "away_shots": away_shots,
+        "away_xg": away_xg,
+        "away_played": away_played,
+    }
+    matches = sync()
+    for match in matches.select(date):
+        if match["name"] != name:
+            continue
+        comparison = Game(match, seed).compare(
+            MatchModel.from_match(match, factors),
+            fulltime,
+            steps,
+            antithetic,
         )
+        base = comparison.base.distribution()
+        other = comparison.other.distribution()
+        print(f"{match['competition']['name']} - {name}")
+        for label, probs in [
+            ("base", base.outcomes),
+            ("scenario", other.outcomes),
+        ]:
+            print(
+                f"  {label:<9} W/D/L "
+                + " / ".join(f"{prob:.1%}" for prob in probs)
+            )
+        for label, difference, se, independent, reduction in zip(
+            ["home win", "draw", "away win"],
+            comparison.difference,
+            comparison.standard_errors,
+            comparison.independent_standard_errors,
+            comparison.variance_reduction,
+        ):
+            print(
+                f"  {label:<9} {difference:+.2%} ±{se:.2%} "
+                f"(independent ±{independent:.2%}, "
+                f"variance reduction x{reduction:.1f})"
+            )
+        return
+    raise typer.BadParameter(f"no match named {name} on {date}")
 
 
-@app.command(name="play_100")
-def play_100(date: Optional[str] = None, steps: int = 100) -> None:
+@app.command()
+def sweep(
+    name: str,
+    date: Optional[str] = None,
+    home_shots: Optional[str] = None,
+    home_xg: Optional[str] = None,
+    home_played: Optional[str] = None,
+    away_shots: Optional[str] = None,
+    away_xg: Optional[str] = None,
+    away_played: Optional[str] = None,
+    fulltime: int = 90,
+    steps: int = 10_000,
+    seed: Optional[int] = None,
+    line: float = 2.5,
+    format: Format = Format.text,
+    output: Optional[Path] = None,
+) -> None:
+    """在系数网格上模拟一场比赛, 例如 --home-xg=0.8:1.2:5 --away-xg=0.9,1,1.1,
+    每个组合输出一行"""
     if date is None:
         date = datelib.today().strftime("%Y-%m-%d")
-    matches = Matches()
-    data = matches.get()
-    for match in matches.select(date, data):
-        game = Game(match)
-        result = game.play_100(steps=steps)
+    import sys
+
+    from . import sweep as sweeper
+    from .output import writer
+
+    options = {
+        "home_shots": home_shots,
+        "home_xg": home_xg,
+        "home_played": home_played,
+        "away_shots": away_shots,
+        "away_xg": away_xg,
+        "away_played": away_played,
+    }
+    try:
+        ranges = {
+            key: sweeper.parse_range(value)
+            for key, value in options.items()
+            if value is not None
+        }
+    except ValueError as e:
+        raise typer.BadParameter(str(e))
+
+    matches = sync()
+    match = next(
+        (match for match in matches.select(date) if match["name"] == name),
+        None,
+    )
+    if match is None:
+        raise typer.BadParameter(f"no match named {name} on {date}")
+    rows = sweeper.sweep(match, ranges, fulltime, steps, seed, line)
+
+    file = sys.stdout if output is None else open(output, "w")
+    try:
+        if format != Format.text:
+            out = writer(format, file, fields=sweeper.FIELDS)
+            for result in rows:
+                out.write(dict(result))
+            out.close()
+            return
+        print(f"{match['competition']['name']} - {name}", file=file)
+        print_sweep(rows, list(ranges), line, file)
+    finally:
+        if output is not None:
+            file.close()
+
+
+def print_sweep(
+    rows: list[SweepTypes],
+    keys: list[str],
+    line: float = 2.5,
+    file: Optional[IO[str]] = None,
+) -> None:
+    """keys 为扫描的系数, 每个组合一行"""
+    print(
+        "".join(f"{key:>12}" for key in keys)
+        + f"{'home_win':>10}{'draw':>8}{'away_win':>10}"
+        + f"{'goals':>12}{f'O {line}':>8}{'±':>7}",
+        file=file,
+    )
+    for result in rows:
+        values: dict[str, Any] = dict(result)
+        print(
+            "".join(f"{values[key]:>12.3f}" for key in keys)
+            + f"{result['home_win']:>10.1%}{result['draw']:>8.1%}"
+            + f"{result['away_win']:>10.1%}"
+            + f"{result['home_goals']:>6.2f}{result['away_goals']:>6.2f}"
+            + f"{result['over']:>8.1%}{result['standard_error']:>7.1%}",
+            file=file,
+        )
+
+
+@app.command()
+def season(
+    competition: str,
+    seasons: int = 10_000,
+    seed: Optional[int] = None,
+    fulltime: int = 90,
+    from_: Optional[str] = FROM,
+) -> None:
+    from . import season as simulator
 
+    matches = sync()
+    table = simulator.simulate(
+        simulator.fixtures(matches.read(), competition, from_),
+        seasons,
+        seed,
+        fulltime=fulltime,
+    )
+    print(f"{table.competition} - {table.seasons} seasons")
+    teams = sorted(table.teams, key=table.expected_position)
+    for position, team in enumerate(teams, 1):
+        points = table.points[table.teams.index(team)]
         print(
             (
-                f"{result.competition} - "
-                f"{result.home.name} {result.home.score} : "
-                f"{result.away.score} {result.away.name}"
+                f"{position:>3}. {team:<24} {points:6.1f} pts  "
+                f"1st {table.top(team, 1):6.1%}  "
+                f"top 4 {table.top(team, 4):6.1%}  "
+                f"bottom 3 {table.bottom(team, 3):6.1%}"
+            )
+        )
+
+
+@app.command()
+def serve(
+    host: str = "127.0.0.1",
+    port: int = 8000,
+    interval: float = 60,
+) -> None:
+    from .api import Matches
+    from .server import Server, Simulator
+
+    simulator = Simulator(Matches(), interval)
+    simulator.start()
+    server = Server((host, port), simulator)
+    print(f"Serving on http://{host}:{server.server_port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        simulator.stop()
+
+
+@app.command()
+def bench(
+    steps: Optional[list[int]] = None,
+    engine: Optional[list[Engine]] = None,
+    seasons: int = 3,
+    calls: int = 1000,
+    output: Optional[Path] = None,
+) -> None:
+    import json
+
+    from . import bench as benchmark
+
+    results = benchmark.run(
+        steps or [100, 1000, 10000], engine or list(Engine), seasons, calls
+    )
+    for result in results:
+        line = f"{result['name']:<40} {result['seconds'] * 1e3:10.2f} ms"
+        if result["sims_per_sec"] is not None:
+            line += f" {result['sims_per_sec']:12.0f} sims/s"
+        if result["ns_per_minute"] is not None:
+            line += f" {result['ns_per_minute']:8.0f} ns/min"
+        line += f" {result['peak_bytes'] / 1024:10.1f} KiB"
+        print(line)
+    if output is not None:
+        output.write_text(
+            json.dumps(
+                {"environment": benchmark.environment(), "results": results},
+                indent=2,
             )
         )
 
 
+def print_distribution(
+    distribution: "Distribution", file: Optional[IO[str]] = None
+) -> None:
+    standard_error = ""
+    if distribution.steps:
+        standard_error = f" (±{distribution.max_standard_error:.1%})"
+    print(
+        (
+            f"  W/D/L {distribution.home_win:.1%} / "
+            f"{distribution.draw:.1%} / {distribution.away_win:.1%}"
+            f"{standard_error}  "
+            f"O/U 2.5 {distribution.over(2.5):.1%} / "
+            f"{distribution.under(2.5):.1%}  "
+            f"BTTS {distribution.btts:.1%}"
+        ),
+        file=file,
+    )
+    print(
+        "  "
+        + ", ".join(
+            f"{home}-{away} {prob:.1%}"
+            for home, away, prob in distribution.top_scorelines()
+        ),
+        file=file,
+    )
+
+
 if __name__ == "__main__":
     app()
@@ -0,0 +1,66 @@
+import os
+from pathlib import Path
+from types import TracebackType
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover
+    # 没有 fcntl 的平台 (Windows) 上文件锁不起作用
+    fcntl = None  # type: ignore[assignment]
+
+
+def atomic_write(file: Path, content: bytes | str) -> None:
+    """先写入同目录下的临时文件再替换, 读取者不会看到写了一半的文件.
+    临时文件名带上进程号, 多个进程同时写入同一个文件时互不干扰"""
+    tmp = file.with_name(f"{file.name}.{os.getpid()}.tmp")
+    mode = "wb" if isinstance(content, bytes) else "w"
+    with open(tmp, mode) as f:
+        f.write(content)
+    os.replace(tmp, file)
+
+
+class FileLock:
+    """基于 flock 的进程间互斥锁, 进程退出时由系统自动释放"""
+
+    def __init__(self, file: Path) -> None:
+        self.file = file
+        self._fd: int | None = None
+
+    def acquire(self, blocking: bool = True) -> bool:
+        """blocking 为 False 且锁被其他进程持有时立即返回 False"""
+        fd = os.open(self.file, os.O_RDWR | os.O_CREAT, 0o644)
+        if fcntl is not None:
+            flags = (
+                fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB
+            )
+            try:
+                fcntl.flock(fd, flags)
+            except BlockingIOError:
+                os.close(fd)
+                return False
+        self._fd = fd
+        return True
+
+    def release(self) -> None:
+        if self._fd is not None:
+            if fcntl is not None:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+            os.close(self._fd)
+            self._fd = None
+
+    @property
+    def locked(self) -> bool:
+        return self._fd is not None
+
+    def __enter__(self) -> "FileLock":
+        if not self.locked:
+            self.acquire()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.release()
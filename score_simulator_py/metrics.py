@@ -0,0 +1,85 @@
+import time
+from collections.abc import Callable, Iterator
+from contextlib import AbstractContextManager, contextmanager, nullcontext
+
+from .types import ProfileTypes
+
+
+class Profile:
+    """一次运行中各阶段的耗时 (秒) 与计数"""
+
+    def __init__(self) -> None:
+        self.phases: dict[str, float] = {}
+        self.counters: dict[str, int] = {}
+
+    def add_time(self, name: str, seconds: float) -> None:
+        self.phases[name] = self.phases.get(name, 0.0) + seconds
+
+    def incr(self, name: str, n: int = 1) -> None:
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    def summary(self) -> ProfileTypes:
+        return {"phases": dict(self.phases), "counters": dict(self.counters)}
+
+    def report(self) -> str:
+        lines = [
+            f"{name:<20} {seconds * 1e3:10.2f} ms"
+            for name, seconds in self.phases.items()
+        ]
+        lines += [f"{name:<20} {n:10d}" for name, n in self.counters.items()]
+        return "\n".join(lines)
+
+
+class _Phase:
+    __slots__ = ("profile", "name", "start")
+
+    def __init__(self, profile: Profile, name: str) -> None:
+        self.profile = profile
+        self.name = name
+        self.start = 0.0
+
+    def __enter__(self) -> None:
+        self.start = time.perf_counter()
+
+    def __exit__(self, *args: object) -> None:
+        self.profile.add_time(self.name, time.perf_counter() - self.start)
+
+
+# 未开启时 phase 和 count 只检查一次 _active, 几乎没有开销
+_active: Profile | None = None
+_disabled: AbstractContextManager[None] = nullcontext()
+_hooks: list[Callable[[Profile], None]] = []
+
+
+def phase(name: str) -> AbstractContextManager[None]:
+    if _active is None:
+        return _disabled
+    return _Phase(_active, name)
+
+
+def count(name: str, n: int = 1) -> None:
+    if _active is not None:
+        _active.incr(name, n)
+
+
+def add_hook(hook: Callable[[Profile], None]) -> None:
+    """profiling 结束时以 Profile 调用 hook, 可用于上报到外部的监控系统"""
+    _hooks.append(hook)
+
+
+def remove_hook(hook: Callable[[Profile], None]) -> None:
+    _hooks.remove(hook)
+
+
+@contextmanager
+def profiling() -> Iterator[Profile]:
+    global _active
+    previous = _active
+    profile = _active = Profile()
+    try:
+        with _Phase(profile, "total"):
+            yield profile
+    finally:
+        _active = previous
+    for hook in list(_hooks):
+        hook(profile)
@@ -1,5 +1,26 @@
+import heapq
+import math
 from collections import Counter
 from dataclasses import dataclass, field
+from typing import Callable, Mapping, NamedTuple
+
+from .types import MatchTypes
+
+# 比分矩阵的上限, 超过的进球数计入最后一格
+MAX_GOALS = 10
+# MatchModel.from_match 可以调整的统计量
+FACTORS = (
+    "home_shots",
+    "home_xg",
+    "home_played",
+    "away_shots",
+    "away_xg",
+    "away_played",
+)
+
+
+def _empty_scorelines() -> list[list[float]]:
+    return [[0] * (MAX_GOALS + 1) for _ in range(MAX_GOALS + 1)]
 
 
 @dataclass
@@ -34,6 +55,7 @@ class Result:
             name=self.home.name,
             shots=self.home.shots + result.home.shots,
             score=self.home.score + result.home.score,
+            xg=self.home.xg + result.home.xg,
             goal_minutes=self.home.goal_minutes + result.home.goal_minutes,
         )
         away = ResultTeam(
@@ -122,6 +144,357 @@ class Result:
         self.played = False
 
 
+@dataclass
+class TeamAggregate:
+    """一支球队在多场模拟中的累计量, 大小与模拟场次无关.
+    解析引擎的结果为期望值, 所以允许为小数"""
+
+    name: str
+    shots: float = 0
+    score: float = 0
+    xg: float = 0
+    shots_sq: float = 0
+    score_sq: float = 0
+    xg_sq: float = 0
+    # 每分钟的进球次数
+    goal_counts: list[int] = field(default_factory=list)
+
+    def add(self, team: ResultTeam) -> None:
+        self.shots += team.shots
+        self.score += team.score
+        self.xg += team.xg
+        self.shots_sq += team.shots**2
+        self.score_sq += team.score**2
+        self.xg_sq += team.xg**2
+        for minute in team.goal_minutes:
+            self.goal_counts[minute] += 1
+
+    def __add__(self, team: "TeamAggregate") -> "TeamAggregate":
+        return TeamAggregate(
+            name=self.name,
+            shots=self.shots + team.shots,
+            score=self.score + team.score,
+            xg=self.xg + team.xg,
+            shots_sq=self.shots_sq + team.shots_sq,
+            score_sq=self.score_sq + team.score_sq,
+            xg_sq=self.xg_sq + team.xg_sq,
+            goal_counts=[
+                a + b for a, b in zip(self.goal_counts, team.goal_counts)
+            ],
+        )
+
+    def std(self, stat: str, steps: int) -> float:
+        """stat 为 shots, score 或 xg, 返回每场的样本标准差"""
+        if steps < 2:
+            return 0.0
+        total: float = getattr(self, stat)
+        total_sq: float = getattr(self, f"{stat}_sq")
+        variance = (total_sq - total**2 / steps) / (steps - 1)
+        return math.sqrt(max(variance, 0.0))
+
+
+@dataclass
+class Aggregate:
+    """流式累加每场模拟的结果, 代替保存所有 Result 再求和.
+    exact 为 True 时是解析计算的一场期望结果, 不是模拟得到的"""
+
+    home: TeamAggregate
+    away: TeamAggregate
+    competition: str
+    timing: int = 90
+    steps: int = 0
+    # scorelines[主队进球][客队进球] 的场次
+    scorelines: list[list[float]] = field(default_factory=_empty_scorelines)
+    exact: bool = False
+    # 对偶抽样 (antithetic) 时的成对场次, 以及每对中主胜/平局/客胜次数的平方和
+    pairs: int = 0
+    pair_sq: list[int] = field(default_factory=lambda: [0, 0, 0])
+
+    def add(self, result: Result) -> None:
+        self.home.add(result.home)
+        self.away.add(result.away)
+        self.steps += 1
+        home_score = min(result.home.score, MAX_GOALS)
+        away_score = min(result.away.score, MAX_GOALS)
+        self.scorelines[home_score][away_score] += 1
+
+    def __add__(self, aggregate: "Aggregate") -> "Aggregate":
+        return Aggregate(
+            home=self.home + aggregate.home,
+            away=self.away + aggregate.away,
+            competition=self.competition,
+            timing=self.timing,
+            steps=self.steps + aggregate.steps,
+            scorelines=[
+                [a + b for a, b in zip(row, other)]
+                for row, other in zip(self.scorelines, aggregate.scorelines)
+            ],
+            exact=self.exact and aggregate.exact,
+            pairs=self.pairs + aggregate.pairs,
+            pair_sq=[a + b for a, b in zip(self.pair_sq, aggregate.pair_sq)],
+        )
+
+    def distribution(self) -> "Distribution":
+        if self.exact:
+            return Distribution(
+                home=self.home.name,
+                away=self.away.name,
+                competition=self.competition,
+                scorelines=[list(row) for row in self.scorelines],
+                home_goals=self.home.score,
+                away_goals=self.away.score,
+            )
+        distribution = Distribution(
+            home=self.home.name,
+            away=self.away.name,
+            competition=self.competition,
+            scorelines=[
+                [count / self.steps for count in row]
+                for row in self.scorelines
+            ],
+            home_goals=self.home.score / self.steps,
+            away_goals=self.away.score / self.steps,
+            home_goals_se=self.home.std("score", self.steps)
+            / math.sqrt(self.steps),
+            away_goals_se=self.away.std("score", self.steps)
+            / math.sqrt(self.steps),
+            steps=self.steps,
+        )
+        if self.pairs > 1:
+            distribution.variance_ratios = self._variance_ratios(distribution)
+        return distribution
+
+    def _variance_ratios(self, distribution: "Distribution") -> list[float]:
+        """由每对结果之和 s 的样本方差得到概率估计的方差,
+        再除以同样场次独立抽样时的方差 p(1 - p) / steps"""
+        ratios = []
+        for prob, pair_sq in zip(distribution.outcomes, self.pair_sq):
+            independent = 2 * prob * (1 - prob)
+            variance = (
+                (pair_sq / self.pairs - (2 * prob) ** 2)
+                * self.pairs
+                / (self.pairs - 1)
+            )
+            ratios.append(
+                max(variance, 0.0) / independent if independent else 1.0
+            )
+        return ratios
+
+    def mean(self) -> Result:
+        """与 Result._divide 相同的平均结果"""
+        home_score = int(self.home.score // self.steps)
+        home = ResultTeam(
+            name=self.home.name,
+            shots=int(self.home.shots // self.steps),
+            score=home_score,
+            xg=self.home.xg / self.steps,
+            goal_minutes=self._top_goal_periods(
+                self.home.goal_counts, home_score
+            ),
+        )
+        away_score = int(self.away.score // self.steps)
+        away = ResultTeam(
+            name=self.away.name,
+            shots=int(self.away.shots // self.steps),
+            score=away_score,
+            xg=self.away.xg / self.steps,
+            goal_minutes=self._top_goal_periods(
+                self.away.goal_counts, away_score
+            ),
+        )
+        return Result(
+            home=home,
+            away=away,
+            competition=self.competition,
+            timing=self.timing,
+            played=True,
+        )
+
+    def _top_goal_periods(self, goal_counts: list[int], n: int) -> list[int]:
+        # 选择前 n 个进球次数最多的时段, 不包括没有进球的时段
+        minutes = [minute for minute, count in enumerate(goal_counts) if count]
+        top_periods = heapq.nlargest(n, minutes, key=goal_counts.__getitem__)
+        return sorted(top_periods)
+
+
+@dataclass
+class Distribution:
+    """一场比赛的赛果分布, scorelines[主队进球][客队进球] 为该比分的概率.
+    steps 为 None 时表示解析计算的精确分布, 标准误为 0.
+    variance_ratios 为主胜/平局/客胜概率的估计方差与独立抽样时的比值"""
+
+    home: str
+    away: str
+    competition: str
+    scorelines: list[list[float]]
+    home_goals: float = 0
+    away_goals: float = 0
+    home_goals_se: float = 0
+    away_goals_se: float = 0
+    steps: int | None = None
+    variance_ratios: list[float] | None = None
+
+    def _sum(self, condition: Callable[[int, int], bool]) -> float:
+        return sum(
+            prob
+            for home, row in enumerate(self.scorelines)
+            for away, prob in enumerate(row)
+            if condition(home, away)
+        )
+
+    @property
+    def home_win(self) -> float:
+        return self._sum(lambda home, away: home > away)
+
+    @property
+    def draw(self) -> float:
+        return self._sum(lambda home, away: home == away)
+
+    @property
+    def away_win(self) -> float:
+        return self._sum(lambda home, away: home < away)
+
+    @property
+    def outcomes(self) -> tuple[float, float, float]:
+        return self.home_win, self.draw, self.away_win
+
+    @property
+    def btts(self) -> float:
+        return self._sum(lambda home, away: home > 0 and away > 0)
+
+    def over(self, line: float = 2.5) -> float:
+        return self._sum(lambda home, away: home + away > line)
+
+    def under(self, line: float = 2.5) -> float:
+        return self._sum(lambda home, away: home + away < line)
+
+    def standard_error(self, prob: float) -> float:
+        """由 steps 场模拟估计出的概率 prob 的标准误"""
+        if not self.steps:
+            return 0.0
+        return math.sqrt(prob * (1 - prob) / self.steps)
+
+    @property
+    def standard_errors(self) -> list[float]:
+        """主胜, 平局, 客胜概率的标准误, 使用方差缩减时按 variance_ratios 缩放"""
+        ratios = self.variance_ratios or [1.0, 1.0, 1.0]
+        return [
+            self.standard_error(prob) * math.sqrt(ratio)
+            for prob, ratio in zip(self.outcomes, ratios)
+        ]
+
+    @property
+    def max_standard_error(self) -> float:
+        return max(self.standard_errors)
+
+    @property
+    def variance_reduction(self) -> float | None:
+        """与同样场次的独立抽样相比方差缩小的倍数, 取胜平负中最小的一个.
+        达到同样的标准误只需要 1 / variance_reduction 的场次"""
+        if self.variance_ratios is None:
+            return None
+        ratio = max(self.variance_ratios)
+        return 1 / ratio if ratio else math.inf
+
+    def top_scorelines(self, n: int = 3) -> list[tuple[int, int, float]]:
+        scorelines = [
+            (home, away, prob)
+            for home, row in enumerate(self.scorelines)
+            for away, prob in enumerate(row)
+        ]
+        return heapq.nlargest(n, scorelines, key=lambda item: item[2])
+
+
+@dataclass
+class Comparison:
+    """同一场比赛两种情形的模拟结果, 两者使用同一组随机数 (common random
+    numbers). diff_sum 和 diff_sq 为每个单位中 other 与 base 主胜/平局/客胜
+    之差的和与平方和, 单位为一场比赛, 对偶抽样时为一对比赛的平均"""
+
+    base: Aggregate
+    other: Aggregate
+    units: int
+    diff_sum: list[float]
+    diff_sq: list[float]
+
+    @property
+    def difference(self) -> list[float]:
+        return [
+            other - base
+            for base, other in zip(
+                self.base.distribution().outcomes,
+                self.other.distribution().outcomes,
+            )
+        ]
+
+    @property
+    def standard_errors(self) -> list[float]:
+        """差值的标准误, 由成对的差值直接估计"""
+        if self.units < 2:
+            return [0.0, 0.0, 0.0]
+        return [
+            math.sqrt(
+                max(total_sq - total**2 / self.units, 0.0)
+                / (self.units - 1)
+                / self.units
+            )
+            for total, total_sq in zip(self.diff_sum, self.diff_sq)
+        ]
+
+    @property
+    def independent_standard_errors(self) -> list[float]:
+        """两种情形分别独立模拟同样场次时差值的标准误"""
+        base = self.base.distribution()
+        other = self.other.distribution()
+        return [
+            math.sqrt(
+                base.standard_error(base_prob) ** 2
+                + other.standard_error(other_prob) ** 2
+            )
+            for base_prob, other_prob in zip(base.outcomes, other.outcomes)
+        ]
+
+    @property
+    def variance_reduction(self) -> list[float]:
+        """与独立模拟相比差值的方差缩小的倍数"""
+        return [
+            (independent / se) ** 2 if se else math.inf
+            for independent, se in zip(
+                self.independent_standard_errors, self.standard_errors
+            )
+        ]
+
+
+@dataclass
+class SeasonTable:
+    """赛季模拟的结果, positions[i][j] 为 teams[i] 最终排在第 j + 1 名的概率,
+    points[i] 为最终积分的期望"""
+
+    competition: str
+    teams: list[str]
+    positions: list[list[float]]
+    points: list[float]
+    seasons: int
+
+    def _index(self, team: str) -> int:
+        return self.teams.index(team)
+
+    def probability(self, team: str, position: int) -> float:
+        return self.positions[self._index(team)][position - 1]
+
+    def top(self, team: str, n: int = 1) -> float:
+        return sum(self.positions[self._index(team)][:n])
+
+    def bottom(self, team: str, n: int = 3) -> float:
+        return sum(self.positions[self._index(team)][-n:])
+
+    def expected_position(self, team: str) -> float:
+        return sum(
+            (position + 1) * prob
+            for position, prob in enumerate(self.positions[self._index(team)])
+        )
+
+
 @dataclass
 class StepTeam:
     shot: bool = False
@@ -133,3 +506,75 @@ class StepTeam:
 class Step:
     home: StepTeam
     away: StepTeam
+
+
+class MatchModel(NamedTuple):
+    """由 MatchTypes 预先计算好的每场比赛的模拟参数"""
+
+    home_name: str
+    away_name: str
+    competition: str
+    home_xg_per_shot: float
+    away_xg_per_shot: float
+    home_shot_percentage: float
+    shot_prob_per_minute: float
+
+    @classmethod
+    def from_match(
+        cls, match: MatchTypes, factors: Mapping[str, float] | None = None
+    ) -> "MatchModel":
+        """factors 的键为 FACTORS 中的名字, 把对应的统计量乘以系数,
+        例如 {"home_xg": 1.1} 为主队 xg 提高 10% 的假设情形"""
+        stats = {
+            f"{side}_{stat}": float(value)
+            for side, team in (
+                ("home", match["home"]),
+                ("away", match["away"]),
+            )
+            for stat, value in (
+                ("shots", team["shots"]),
+                ("xg", team["xg"]),
+                ("played", team["played"]),
+            )
+        }
+        for key, factor in (factors or {}).items():
+            if key not in stats:
+                raise ValueError(f"unknown factor {key}")
+            stats[key] *= factor
+        for side, team in (("home", match["home"]), ("away", match["away"])):
+            name = team["name"]
+            if stats[f"{side}_shots"] <= 0:
+                raise ValueError(f"{name} has no shots")
+            if stats[f"{side}_played"] <= 0:
+                raise ValueError(f"{name} has not played")
+            if stats[f"{side}_xg"] < 0:
+                raise ValueError(f"{name} has negative xg")
+
+        shots = stats["home_shots"] + stats["away_shots"]
+        played = (stats["home_played"] + stats["away_played"]) / 2
+        return cls(
+            home_name=match["home"]["name"],
+            away_name=match["away"]["name"],
+            competition=match["competition"]["name"],
+            home_xg_per_shot=stats["home_xg"] / stats["home_shots"],
+            away_xg_per_shot=stats["away_xg"] / stats["away_shots"],
+            home_shot_percentage=stats["home_shots"] / shots,
+            shot_prob_per_minute=shots / played / 90,
+        )
+
+    def new_aggregate(self, timing: int = 90) -> Aggregate:
+        return Aggregate(
+            home=TeamAggregate(name=self.home_name, goal_counts=[0] * timing),
+            away=TeamAggregate(name=self.away_name, goal_counts=[0] * timing),
+            competition=self.competition,
+            timing=timing,
+        )
+
+    def new_result(self, timing: int = 0, played: bool = False) -> Result:
+        return Result(
+            home=ResultTeam(name=self.home_name),
+            away=ResultTeam(name=self.away_name),
+            competition=self.competition,
+            timing=timing,
+            played=played,
+        )
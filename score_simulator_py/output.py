@@ -0,0 +1,139 @@
+import csv
+import json
+from abc import ABC, abstractmethod
+from typing import IO, Any
+
+from .models import Aggregate
+from .types import Format
+
+FIELDS = [
+    "date",
+    "competition",
+    "home",
+    "away",
+    "home_score",
+    "away_score",
+    "home_shots",
+    "away_shots",
+    "home_xg",
+    "away_xg",
+    "home_goal_minutes",
+    "away_goal_minutes",
+    "home_win",
+    "draw",
+    "away_win",
+    "standard_error",
+    "variance_reduction",
+    "steps",
+]
+
+
+def record(aggregate: Aggregate, date: str | None = None) -> dict[str, Any]:
+    """一场比赛的平均结果和胜平负概率"""
+    result = aggregate.mean()
+    distribution = aggregate.distribution()
+    return {
+        "date": date,
+        "competition": result.competition,
+        "home": result.home.name,
+        "away": result.away.name,
+        "home_score": result.home.score,
+        "away_score": result.away.score,
+        "home_shots": result.home.shots,
+        "away_shots": result.away.shots,
+        "home_xg": result.home.xg,
+        "away_xg": result.away.xg,
+        "home_goal_minutes": result.home.goal_minutes,
+        "away_goal_minutes": result.away.goal_minutes,
+        "home_win": distribution.home_win,
+        "draw": distribution.draw,
+        "away_win": distribution.away_win,
+        "standard_error": distribution.max_standard_error,
+        "variance_reduction": distribution.variance_reduction,
+        "steps": distribution.steps,
+    }
+
+
+class Writer(ABC):
+    """逐条写入 record, flush 为 True 时每条写完立即刷新,
+    让下游在整批完成前就能读到结果"""
+
+    def __init__(
+        self, file: IO[str], flush: bool = False, fields: list[str] = FIELDS
+    ) -> None:
+        self.file = file
+        self.flush = flush
+        self.fields = fields
+
+    def write(self, record: dict[str, Any]) -> None:
+        self._write(record)
+        if self.flush:
+            self.file.flush()
+
+    @abstractmethod
+    def _write(self, record: dict[str, Any]) -> None:
+        ...
+
+    def close(self) -> None:
+        self.file.flush()
+
+
+class JsonlWriter(Writer):
+    def _write(self, record: dict[str, Any]) -> None:
+        self.file.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+
+class JsonWriter(Writer):
+    """流式写出一个 JSON 数组"""
+
+    def __init__(
+        self, file: IO[str], flush: bool = False, fields: list[str] = FIELDS
+    ) -> None:
+        super().__init__(file, flush, fields)
+        self.count = 0
+
+    def _write(self, record: dict[str, Any]) -> None:
+        self.file.write("[\n  " if self.count == 0 else ",\n  ")
+        self.file.write(json.dumps(record, ensure_ascii=False))
+        self.count += 1
+
+    def close(self) -> None:
+        self.file.write("[]\n" if self.count == 0 else "\n]\n")
+        super().close()
+
+
+class CsvWriter(Writer):
+    def __init__(
+        self, file: IO[str], flush: bool = False, fields: list[str] = FIELDS
+    ) -> None:
+        super().__init__(file, flush, fields)
+        self.writer = csv.DictWriter(file, fields, lineterminator="\n")
+        self.writer.writeheader()
+
+    def _write(self, record: dict[str, Any]) -> None:
+        # 进球分钟等列表用空格连接
+        self.writer.writerow(
+            {
+                key: " ".join(map(str, value))
+                if isinstance(value, list)
+                else value
+                for key, value in record.items()
+            }
+        )
+
+
+WRITERS: dict[Format, type[Writer]] = {
+    Format.json: JsonWriter,
+    Format.jsonl: JsonlWriter,
+    Format.csv: CsvWriter,
+}
+
+
+def writer(
+    format: Format,
+    file: IO[str],
+    flush: bool = False,
+    fields: list[str] = FIELDS,
+) -> Writer:
+    """fields 为 CSV 的列, 默认为 record 的字段"""
+    return WRITERS[format](file, flush, fields)
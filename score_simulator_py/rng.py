@@ -0,0 +1,15 @@
+import hashlib
+import secrets
+
+
+def entropy() -> int:
+    """没有指定种子时使用的 128 位随机种子"""
+    return secrets.randbits(128)
+
+
+def spawn(seed: int, *key: int | str) -> int:
+    """参考 numpy SeedSequence 的做法, 由父种子和 key 路径派生出互相独立的子种子,
+    同样的 seed 和 key 总是得到同样的子种子"""
+    data = "/".join(str(part) for part in (seed, *key)).encode()
+    digest = hashlib.blake2b(data, digest_size=16).digest()
+    return int.from_bytes(digest, "big")
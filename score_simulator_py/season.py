@@ -0,0 +1,195 @@
+from datetime import date
+from typing import Any
+
+import numpy as np
+import numpy.typing as npt
+
+from .analytic import goal_probs, tail_scorelines
+from .models import MAX_GOALS, MatchModel, SeasonTable
+from .types import MatchesTypes, MatchTypes, StandingTypes
+
+# 每批模拟的赛季数, 内存占用只与 CHUNK_SIZE x 球队数有关
+CHUNK_SIZE = 10_000
+# 两个比赛日相隔超过该天数时视为不同赛季 (冬歇期通常更短)
+SEASON_GAP = 60
+
+
+def fixtures(
+    data: MatchesTypes, competition: str, start: str | None = None
+) -> list[MatchTypes]:
+    """competition 在 start (含) 之后的比赛.
+    start 为 None 时取当前赛季, 见 season_start"""
+    days = {
+        day: [
+            match
+            for match in matches
+            if match["competition"]["name"] == competition
+        ]
+        for day, matches in data.items()
+    }
+    days = {day: matches for day, matches in days.items() if matches}
+    if start is None:
+        start = season_start(days)
+    return [
+        match
+        for day, matches in days.items()
+        if start is None or day >= start
+        for match in matches
+    ]
+
+
+def season_start(days: dict[str, list[MatchTypes]]) -> str | None:
+    """从最早的未结束比赛所在日期 (全部结束时为最后一个比赛日) 向前,
+    直到两个比赛日相隔超过 SEASON_GAP 天, 返回当前赛季的第一个比赛日"""
+    dates = sorted(days)
+    if not dates:
+        return None
+    unfinished = [
+        day
+        for day in dates
+        if not all(is_played(match) for match in days[day])
+    ]
+    index = dates.index(unfinished[0]) if unfinished else len(dates) - 1
+    while index > 0:
+        gap = date.fromisoformat(dates[index]) - date.fromisoformat(
+            dates[index - 1]
+        )
+        if gap.days > SEASON_GAP:
+            break
+        index -= 1
+    return dates[index]
+
+
+def is_played(match: MatchTypes) -> bool:
+    return (
+        match["finished"]
+        and match["home"]["score"] is not None
+        and match["away"]["score"] is not None
+    )
+
+
+def standings(matches: list[MatchTypes]) -> dict[str, StandingTypes]:
+    """由已结束的比赛计算当前积分榜, 胜 3 分平 1 分"""
+    table: dict[str, StandingTypes] = {}
+    for match in matches:
+        for team in (match["home"], match["away"]):
+            table.setdefault(
+                team["name"], {"points": 0, "goals_for": 0, "goals_against": 0}
+            )
+        home_score = match["home"]["score"]
+        away_score = match["away"]["score"]
+        if not match["finished"] or home_score is None or away_score is None:
+            continue
+        for team, scored, conceded in (
+            (match["home"], home_score, away_score),
+            (match["away"], away_score, home_score),
+        ):
+            standing = table[team["name"]]
+            standing["goals_for"] += scored
+            standing["goals_against"] += conceded
+            if scored > conceded:
+                standing["points"] += 3
+            elif scored == conceded:
+                standing["points"] += 1
+    return table
+
+
+def scoreline_cdf(model: MatchModel, fulltime: int = 90) -> npt.NDArray[Any]:
+    """整场比分分布 (与 play_from 相同的精确分布) 展平后的累积概率"""
+    home_goal_prob, away_goal_prob = goal_probs(model)
+    scorelines = tail_scorelines(home_goal_prob, away_goal_prob, fulltime)
+    cdf = np.cumsum(np.asarray(scorelines).ravel())
+    result: npt.NDArray[Any] = cdf / cdf[-1]
+    return result
+
+
+def simulate(
+    matches: list[MatchTypes],
+    seasons: int = 10_000,
+    seed: int | None = None,
+    current: dict[str, StandingTypes] | None = None,
+    fulltime: int = 90,
+) -> SeasonTable:
+    """模拟 matches 中未结束的比赛 seasons 次, 得到每支球队最终名次的概率.
+    current 为 None 时由已结束的比赛计算当前积分榜.
+    排名依次比较积分, 净胜球, 进球, 仍相同时随机排列"""
+    if not matches:
+        raise ValueError("no fixtures to simulate")
+    if current is None:
+        current = standings(matches)
+    teams = list(current)
+    for match in matches:
+        for team in (match["home"], match["away"]):
+            if team["name"] not in current:
+                teams.append(team["name"])
+    index = {team: i for i, team in enumerate(teams)}
+    size = len(teams)
+    empty: StandingTypes = {"points": 0, "goals_for": 0, "goals_against": 0}
+    base = np.array(
+        [
+            [
+                current.get(team, empty)["points"],
+                current.get(team, empty)["goals_for"],
+                current.get(team, empty)["goals_against"],
+            ]
+            for team in teams
+        ],
+        dtype=np.int64,
+    )
+
+    # 每场比赛的比分分布只计算一次, 所有赛季共用
+    remaining = [
+        (
+            index[match["home"]["name"]],
+            index[match["away"]["name"]],
+            scoreline_cdf(MatchModel.from_match(match), fulltime),
+        )
+        for match in matches
+        if not is_played(match)
+    ]
+
+    rng = np.random.default_rng(seed)
+    counts = np.zeros(size * size, dtype=np.int64)
+    total_points = np.zeros(size, dtype=np.float64)
+    for start in range(0, seasons, CHUNK_SIZE):
+        n = min(CHUNK_SIZE, seasons - start)
+        points = np.tile(base[:, 0], (n, 1))
+        goals_for = np.tile(base[:, 1], (n, 1))
+        goals_against = np.tile(base[:, 2], (n, 1))
+
+        for home, away, cdf in remaining:
+            scoreline = np.minimum(
+                np.searchsorted(cdf, rng.random(n), side="right"),
+                cdf.size - 1,
+            )
+            home_score, away_score = np.divmod(scoreline, MAX_GOALS + 1)
+            draw = home_score == away_score
+            points[:, home] += 3 * (home_score > away_score) + draw
+            points[:, away] += 3 * (home_score < away_score) + draw
+            goals_for[:, home] += home_score
+            goals_for[:, away] += away_score
+            goals_against[:, home] += away_score
+            goals_against[:, away] += home_score
+
+        # lexsort 以最后一个键为主键, 升序排列后反转得到名次
+        order = np.lexsort(
+            (
+                rng.random((n, size)),
+                goals_for,
+                goals_for - goals_against,
+                points,
+            ),
+            axis=-1,
+        )[:, ::-1]
+        counts += np.bincount(
+            (order * size + np.arange(size)).ravel(), minlength=size * size
+        )
+        total_points += points.sum(axis=0)
+
+    return SeasonTable(
+        competition=matches[0]["competition"]["name"],
+        teams=teams,
+        positions=(counts.reshape(size, size) / seasons).tolist(),
+        points=(total_points / seasons).tolist(),
+        seasons=seasons,
+    )
@@ -0,0 +1,246 @@
+import json
+import threading
+from collections.abc import Callable
+from concurrent.futures import Future
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+from urllib.parse import parse_qs, urlparse
+
+from .api import Matches, simulate_many
+from .models import Aggregate, MatchModel
+from .store import MatchStore
+from .types import Engine, MatchesTypes, MatchTypes
+
+# 后台检查数据是否需要更新的间隔 (秒)
+RELOAD_INTERVAL = 60
+
+
+def summary(aggregate: Aggregate) -> dict[str, Any]:
+    result = aggregate.mean()
+    distribution = aggregate.distribution()
+    return {
+        "competition": result.competition,
+        "home": result.home.name,
+        "away": result.away.name,
+        "home_score": result.home.score,
+        "away_score": result.away.score,
+        "home_xg": result.home.xg,
+        "away_xg": result.away.xg,
+        "home_win": distribution.home_win,
+        "draw": distribution.draw,
+        "away_win": distribution.away_win,
+        "standard_error": distribution.max_standard_error,
+        "steps": distribution.steps,
+    }
+
+
+class Simulator:
+    """常驻内存的比赛数据和 MatchModel, 同一场比赛的并发请求只模拟一次"""
+
+    def __init__(
+        self, matches: Matches, interval: float = RELOAD_INTERVAL
+    ) -> None:
+        self.matches = matches
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._data: MatchesTypes = {}
+        self._signature: list[int] | None = None
+        self._models: dict[tuple[str, str], MatchModel] = {}
+        self._inflight: dict[tuple[Any, ...], Future[Any]] = {}
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def reload(self) -> bool:
+        """按 max_age 更新本地数据, 文件变化时才重新读取并清空 MatchModel"""
+        self.matches.sync()
+        signature = MatchStore.signature(self.matches.store.file)
+        if signature == self._signature:
+            return False
+        data = self.matches.read()
+        with self._lock:
+            self._data = data
+            self._signature = signature
+            self._models = {}
+        return True
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                self.reload()
+            except Exception:
+                # 更新失败时继续使用内存中的数据
+                continue
+
+    def start(self) -> None:
+        self.reload()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def select(self, date: str) -> list[MatchTypes]:
+        with self._lock:
+            return self._data[date]
+
+    def model(self, match: MatchTypes) -> MatchModel:
+        """数据有误时抛出 RuntimeError, 与请求参数的错误区分开"""
+        key = (match["name"], match["utc_time"])
+        with self._lock:
+            model = self._models.get(key)
+        if model is None:
+            try:
+                model = MatchModel.from_match(match)
+            except Exception as e:
+                raise RuntimeError(
+                    f"invalid data for {match['name']}: {e}"
+                ) from e
+            with self._lock:
+                self._models[key] = model
+        return model
+
+    def _single_flight(
+        self, key: tuple[Any, ...], func: Callable[[], Any]
+    ) -> Any:
+        """相同 key 的请求在第一个完成前到达时, 等待并共享它的结果"""
+        with self._lock:
+            future = self._inflight.get(key)
+            owner = future is None
+            if future is None:
+                future = self._inflight[key] = Future()
+        if owner:
+            try:
+                future.set_result(func())
+            except BaseException as e:
+                future.set_exception(e)
+            finally:
+                with self._lock:
+                    del self._inflight[key]
+        return future.result()
+
+    def simulate_match(
+        self,
+        date: str,
+        name: str,
+        steps: int = 100,
+        fulltime: int = 90,
+        engine: Engine = Engine.python,
+        seed: int | None = None,
+    ) -> dict[str, Any]:
+        if steps < 1:
+            raise ValueError("steps must be positive")
+        for match in self.select(date):
+            if match["name"] == name:
+                break
+        else:
+            raise KeyError(name)
+
+        def run() -> dict[str, Any]:
+            (aggregate,) = simulate_many(
+                [match],
+                steps,
+                fulltime=fulltime,
+                engine=engine,
+                seed=seed,
+                models=[self.model(match)],
+            )
+            return summary(aggregate)
+
+        key = (date, name, match["utc_time"], steps, fulltime, engine, seed)
+        result: dict[str, Any] = self._single_flight(key, run)
+        return result
+
+    def simulate_date(
+        self,
+        date: str,
+        steps: int = 100,
+        fulltime: int = 90,
+        engine: Engine = Engine.python,
+        seed: int | None = None,
+    ) -> list[dict[str, Any]]:
+        return [
+            self.simulate_match(
+                date, match["name"], steps, fulltime, engine, seed
+            )
+            for match in self.select(date)
+        ]
+
+
+def required(query: dict[str, str], key: str) -> str:
+    if key not in query:
+        raise ValueError(f"missing parameter: {key}")
+    return query[key]
+
+
+def options(query: dict[str, str]) -> dict[str, Any]:
+    return {
+        "steps": int(query.get("steps", 100)),
+        "fulltime": int(query.get("fulltime", 90)),
+        "engine": Engine(query.get("engine", Engine.python)),
+        "seed": int(query["seed"]) if "seed" in query else None,
+    }
+
+
+class Handler(BaseHTTPRequestHandler):
+    """GET /match?date=&name=&steps=&fulltime=&engine=&seed=
+    GET /date?date=&steps=&fulltime=&engine=&seed=
+    GET /health"""
+
+    server: "Server"
+
+    def send_json(self, status: HTTPStatus, body: Any) -> None:
+        content = json.dumps(body, ensure_ascii=False).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def do_GET(self) -> None:
+        url = urlparse(self.path)
+        if url.path == "/health":
+            self.send_json(HTTPStatus.OK, {"status": "ok"})
+            return
+        if url.path not in ("/match", "/date"):
+            self.send_json(HTTPStatus.NOT_FOUND, {"error": "not found"})
+            return
+        query = {
+            key: values[-1] for key, values in parse_qs(url.query).items()
+        }
+        simulator = self.server.simulator
+        # KeyError 和 ValueError 来自请求参数, 其他异常为服务端错误
+        try:
+            if url.path == "/match":
+                body: Any = simulator.simulate_match(
+                    required(query, "date"),
+                    required(query, "name"),
+                    **options(query),
+                )
+            else:
+                body = simulator.simulate_date(
+                    required(query, "date"), **options(query)
+                )
+        except KeyError as e:
+            self.send_json(HTTPStatus.NOT_FOUND, {"error": f"{e} not found"})
+        except ValueError as e:
+            self.send_json(HTTPStatus.BAD_REQUEST, {"error": str(e)})
+        except Exception as e:
+            self.send_json(HTTPStatus.INTERNAL_SERVER_ERROR, {"error": str(e)})
+        else:
+            self.send_json(HTTPStatus.OK, body)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+
+class Server(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address: tuple[str, int], simulator: Simulator) -> None:
+        super().__init__(address, Handler)
+        self.simulator = simulator
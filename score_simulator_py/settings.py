@@ -0,0 +1,43 @@
+import os
+from dataclasses import dataclass
+
+# 本地数据的默认有效期, 单位为秒
+MAX_AGE = 3600
+# 模拟结果缓存的默认大小上限, 单位为字节
+CACHE_SIZE = 64 * 1024 * 1024
+
+
+@dataclass(frozen=True)
+class Settings:
+    """一次性从 .env 和环境变量中读取的配置, .env 优先"""
+
+    data: str | None = None
+    proxy: str | None = None
+    url: str | None = None
+    max_age: int = MAX_AGE
+    cache_size: int = CACHE_SIZE
+
+    @classmethod
+    def load(cls, env_file: str = ".env") -> "Settings":
+        values: dict[str, str | None] = {}
+        if os.path.exists(env_file):
+            from dotenv import dotenv_values
+
+            values = dotenv_values(env_file)
+
+        def get(key: str) -> str | None:
+            if (value := values.get(key)) is None:
+                value = os.getenv(key)
+            return value
+
+        max_age = get("SCORE_SIMULATOR_MAX_AGE")
+        cache_size = get("SCORE_SIMULATOR_CACHE_SIZE")
+        return cls(
+            data=get("SCORE_SIMULATOR_DATA"),
+            proxy=get("SCORE_SIMULATOR_PROXY"),
+            url=get("SCORE_SIMULATOR_URL"),
+            max_age=int(max_age) if max_age is not None else MAX_AGE,
+            cache_size=(
+                int(cache_size) if cache_size is not None else CACHE_SIZE
+            ),
+        )
@@ -0,0 +1,154 @@
+import json
+import mmap
+import os
+import struct
+from pathlib import Path
+from typing import BinaryIO
+
+from .types import MatchesTypes, MatchTypes
+
+MAGIC = b"SSPMDB01"
+# 文件头: MAGIC + 索引的长度
+HEADER = struct.Struct("<8sI")
+
+
+def encode(matches: list[MatchTypes]) -> bytes:
+    return json.dumps(
+        matches, ensure_ascii=False, separators=(",", ":")
+    ).encode()
+
+
+class MatchStore:
+    """按日期建立索引的比赛数据文件, 读取某一天只需要解析索引和当天的数据.
+
+    文件结构为 HEADER, JSON 索引 {"source": ..., "index": {date: [offset, length]}},
+    之后是每天比赛的紧凑 JSON, offset 从索引结束处开始计算.
+    source 为生成 store 的 matches.json 的签名, 由 store 直接保存的数据为 null"""
+
+    def __init__(self, file: Path) -> None:
+        self.file = file
+        # (文件的 inode, mtime, size), 文件被替换后重新解析索引
+        self._key: tuple[int, int, int] | None = None
+        self._header: (
+            tuple[list[int] | None, dict[str, list[int]], int] | None
+        ) = None
+
+    @staticmethod
+    def signature(source: Path) -> list[int]:
+        stat = source.stat()
+        return [stat.st_mtime_ns, stat.st_size]
+
+    def build(self, data: MatchesTypes, source: Path | None = None) -> None:
+        self._write(
+            [(date, encode(matches)) for date, matches in data.items()],
+            self.signature(source) if source is not None else None,
+        )
+
+    def merge(self, data: MatchesTypes) -> list[str]:
+        """用 data 更新 store, data 为完整的数据, 不在其中的日期被删除.
+        返回新增, 变化或删除的日期. 没有变化的日期直接复制原来的字节,
+        不重新编码; 没有任何变化时不写入文件, 否则仍然重写整个文件"""
+        if not self.is_valid():
+            self.build(data)
+            return list(data)
+
+        changed = []
+        blobs: list[tuple[str, bytes]] = []
+        with (
+            open(self.file, "rb") as f,
+            mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm,
+        ):
+            _, index, start = self._read_header(f)
+            for date, matches in data.items():
+                if date in index:
+                    offset, length = index[date]
+                    blob = mm[start + offset : start + offset + length]
+                    if json.loads(blob) == matches:
+                        blobs.append((date, blob))
+                        continue
+                blobs.append((date, encode(matches)))
+                changed.append(date)
+        changed.extend(date for date in index if date not in data)
+
+        if changed:
+            self._write(blobs, None)
+        return changed
+
+    def _write(
+        self, blobs: list[tuple[str, bytes]], source: list[int] | None
+    ) -> None:
+        """写入临时文件后替换, 读取者不会看到写了一半的文件"""
+        index: dict[str, list[int]] = {}
+        offset = 0
+        for date, blob in blobs:
+            index[date] = [offset, len(blob)]
+            offset += len(blob)
+        header = json.dumps({"source": source, "index": index}).encode()
+
+        tmp = self.file.with_name(f"{self.file.name}.{os.getpid()}.tmp")
+        with open(tmp, "wb") as f:
+            f.write(HEADER.pack(MAGIC, len(header)))
+            f.write(header)
+            for _, blob in blobs:
+                f.write(blob)
+        os.replace(tmp, self.file)
+
+    def _read_header(
+        self, f: BinaryIO | None = None
+    ) -> tuple[list[int] | None, dict[str, list[int]], int]:
+        """从已打开的文件中读取索引, 保证索引和数据来自同一个文件"""
+        if f is None:
+            with open(self.file, "rb") as f:
+                return self._read_header(f)
+        stat = os.fstat(f.fileno())
+        key = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+        if self._header is None or key != self._key:
+            f.seek(0)
+            magic, length = HEADER.unpack(f.read(HEADER.size))
+            if magic != MAGIC:
+                raise ValueError(f"{self.file} is not a match store")
+            header = json.loads(f.read(length))
+            start = HEADER.size + length
+            self._header = (header["source"], header["index"], start)
+            self._key = key
+        return self._header
+
+    def is_valid(self) -> bool:
+        if not self.file.exists():
+            return False
+        try:
+            self._read_header()
+        except (ValueError, struct.error):
+            return False
+        return True
+
+    def is_current(self, source: Path) -> bool:
+        """store 存在且由当前的 source 文件生成"""
+        if not source.exists() or not self.is_valid():
+            return False
+        signature, _, _ = self._read_header()
+        return signature == self.signature(source)
+
+    def dates(self) -> list[str]:
+        _, index, _ = self._read_header()
+        return list(index)
+
+    def load(self, date: str) -> list[MatchTypes]:
+        with open(self.file, "rb") as f:
+            _, index, start = self._read_header(f)
+            offset, length = index[date]
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                blob = mm[start + offset : start + offset + length]
+        matches: list[MatchTypes] = json.loads(blob)
+        return matches
+
+    def read(self) -> MatchesTypes:
+        """读取全部日期的比赛"""
+        with open(self.file, "rb") as f:
+            _, index, start = self._read_header(f)
+            f.seek(0)
+            content = f.read()
+        return {
+            date: json.loads(content[start + offset : start + offset + length])
+            for date, (offset, length) in index.items()
+        }
@@ -0,0 +1,86 @@
+import itertools
+from collections.abc import Mapping, Sequence
+
+from .models import FACTORS, Distribution, MatchModel
+from .types import MatchTypes, SweepTypes
+
+FIELDS = [
+    *FACTORS,
+    "home_win",
+    "draw",
+    "away_win",
+    "home_goals",
+    "away_goals",
+    "over",
+    "btts",
+    "standard_error",
+]
+
+
+def parse_range(text: str) -> list[float]:
+    """'0.8:1.2:5' 为 0.8 到 1.2 之间 (包括两端) 5 个等距的值,
+    '0.9,1,1.1' 为列出的值"""
+    if ":" not in text:
+        return [float(value) for value in text.split(",")]
+    start, stop, num = text.split(":")
+    count = int(num)
+    if count < 1:
+        raise ValueError(f"{text} has no values")
+    if count == 1:
+        return [float(start)]
+    step = (float(stop) - float(start)) / (count - 1)
+    return [float(start) + step * index for index in range(count)]
+
+
+def grid(ranges: Mapping[str, Sequence[float]]) -> list[dict[str, float]]:
+    """ranges 中各个系数取值的全部组合, 键为 FACTORS 中的名字"""
+    for key in ranges:
+        if key not in FACTORS:
+            raise ValueError(f"unknown factor {key}")
+    return [
+        dict(zip(ranges, values))
+        for values in itertools.product(*ranges.values())
+    ]
+
+
+def row(
+    factors: Mapping[str, float], distribution: Distribution, line: float = 2.5
+) -> SweepTypes:
+    return {
+        "home_shots": factors.get("home_shots", 1.0),
+        "home_xg": factors.get("home_xg", 1.0),
+        "home_played": factors.get("home_played", 1.0),
+        "away_shots": factors.get("away_shots", 1.0),
+        "away_xg": factors.get("away_xg", 1.0),
+        "away_played": factors.get("away_played", 1.0),
+        "home_win": distribution.home_win,
+        "draw": distribution.draw,
+        "away_win": distribution.away_win,
+        "home_goals": distribution.home_goals,
+        "away_goals": distribution.away_goals,
+        "over": distribution.over(line),
+        "btts": distribution.btts,
+        "standard_error": distribution.max_standard_error,
+    }
+
+
+def sweep(
+    match: MatchTypes,
+    ranges: Mapping[str, Sequence[float]],
+    fulltime: int = 90,
+    steps: int = 10_000,
+    seed: int | None = None,
+    line: float = 2.5,
+) -> list[SweepTypes]:
+    """按 ranges 的每个组合调整 match 的统计量后模拟, 每个组合一行.
+    所有组合在一次批量计算中共用同一组随机数, 相邻组合之间的差异
+    几乎不受抽样噪声影响. over 为总进球数超过 line 的概率"""
+    from .batch import sweep as simulate
+
+    points = grid(ranges)
+    models = [MatchModel.from_match(match, point) for point in points]
+    distributions = simulate(models, fulltime, steps, seed)
+    return [
+        row(point, distribution, line)
+        for point, distribution in zip(points, distributions)
+    ]
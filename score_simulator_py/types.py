@@ -1,3 +1,4 @@
+from enum import Enum
 from typing import TypedDict
 
 
@@ -25,3 +26,62 @@ class MatchTypes(TypedDict):
 
 
 MatchesTypes = dict[str, list[MatchTypes]]
+
+
+class MetaTypes(TypedDict):
+    etag: str | None
+    last_modified: str | None
+    fetched_at: float
+
+
+class Engine(str, Enum):
+    python = "python"
+    events = "events"
+    numpy = "numpy"
+    poisson = "poisson"
+    dixon_coles = "dixon_coles"
+
+
+class SweepTypes(TypedDict):
+    """参数扫描中一个组合的结果, 系数为 1 表示不调整"""
+
+    home_shots: float
+    home_xg: float
+    home_played: float
+    away_shots: float
+    away_xg: float
+    away_played: float
+    home_win: float
+    draw: float
+    away_win: float
+    home_goals: float
+    away_goals: float
+    over: float
+    btts: float
+    standard_error: float
+
+
+class BenchTypes(TypedDict):
+    name: str
+    seconds: float
+    sims_per_sec: float | None
+    ns_per_minute: float | None
+    peak_bytes: int
+
+
+class ProfileTypes(TypedDict):
+    phases: dict[str, float]
+    counters: dict[str, int]
+
+
+class StandingTypes(TypedDict):
+    points: int
+    goals_for: int
+    goals_against: int
+
+
+class Format(str, Enum):
+    text = "text"
+    json = "json"
+    jsonl = "jsonl"
+    csv = "csv"
@@ -0,0 +1,94 @@
+import math
+
+import pytest
+
+from score_simulator_py.analytic import (
+    DIXON_COLES_RHO,
+    exact,
+    goal_probs,
+    goal_rates,
+    poisson_scorelines,
+    tail_scorelines,
+)
+from score_simulator_py.models import MAX_GOALS, MatchModel
+
+from .data import matches as matches_data
+
+
+@pytest.fixture(scope="module")
+def model() -> MatchModel:
+    return MatchModel.from_match(matches_data["2023-12-08"][0])
+
+
+def test_goal_probs(model: MatchModel) -> None:
+    home, away = goal_probs(model)
+    shot = model.shot_prob_per_minute
+    assert home == pytest.approx(
+        shot * model.home_shot_percentage * model.home_xg_per_shot
+    )
+    assert 0 < away < shot
+
+
+def test_tail_scorelines(model: MatchModel) -> None:
+    tail = tail_scorelines(*goal_probs(model), 90)
+    assert len(tail) == MAX_GOALS + 1
+    assert sum(map(sum, tail)) == pytest.approx(1)
+
+
+def test_tail_scorelines_no_minutes(model: MatchModel) -> None:
+    tail = tail_scorelines(*goal_probs(model), 0)
+    assert tail[0][0] == 1
+
+
+def test_tail_scorelines_cache(model: MatchModel) -> None:
+    tail_scorelines.cache_clear()
+    tail_scorelines(*goal_probs(model), 27)
+    tail_scorelines(*goal_probs(model), 27)
+    assert tail_scorelines.cache_info().hits == 1
+
+
+def test_goal_rates(model: MatchModel) -> None:
+    home, away = goal_rates(model, 90)
+    assert home == pytest.approx(90 * goal_probs(model)[0])
+    assert goal_rates(model, 0) == (0, 0)
+
+
+def test_poisson_scorelines() -> None:
+    scorelines = poisson_scorelines(1.2, 0.8)
+    assert len(scorelines) == MAX_GOALS + 1
+    assert sum(map(sum, scorelines)) == pytest.approx(1)
+    assert scorelines[0][0] == pytest.approx(math.exp(-2))
+    assert scorelines[2][1] == pytest.approx(math.exp(-2) * 1.2**2 / 2 * 0.8)
+
+
+def test_dixon_coles() -> None:
+    poisson = poisson_scorelines(1.2, 0.8)
+    corrected = poisson_scorelines(1.2, 0.8, -0.1)
+    assert sum(map(sum, corrected)) == pytest.approx(1)
+    assert corrected[0][0] > poisson[0][0]
+    assert corrected[1][1] > poisson[1][1]
+    assert corrected[1][0] < poisson[1][0]
+    assert corrected[2][2] == poisson[2][2]
+    # 修正不改变双方进球数的期望
+    for scorelines in (poisson, corrected):
+        home = sum(goals * sum(row) for goals, row in enumerate(scorelines))
+        assert home == pytest.approx(1.2)
+
+
+def test_dixon_coles_out_of_range() -> None:
+    with pytest.raises(ValueError):
+        poisson_scorelines(1.2, 0.8, 2)
+    with pytest.raises(ValueError):
+        poisson_scorelines(1.2, 0.8, -1)
+
+
+def test_exact(model: MatchModel) -> None:
+    aggregate = exact(model, 90, DIXON_COLES_RHO)
+    assert aggregate.exact
+    assert aggregate.steps == 1
+    home_rate, away_rate = goal_rates(model)
+    assert aggregate.home.score == pytest.approx(home_rate)
+    assert aggregate.away.score == pytest.approx(away_rate)
+    distribution = aggregate.distribution()
+    assert distribution.steps is None
+    assert distribution.home_goals == pytest.approx(home_rate)
@@ -1,16 +1,38 @@
+import asyncio
+import json
+import math
 import os
+import time
 from pathlib import Path
 from typing import Any, Generator
 
+import httpx
 import pytest
 import respx
 from httpx import Response
 
-from score_simulator_py.api import MATCHES_URL, Game, Matches
-from score_simulator_py.types import MatchesTypes
+from score_simulator_py import metrics
+from score_simulator_py.analytic import RHO
+from score_simulator_py.api import (
+    MATCHES_URL,
+    STEPS_PER_CHUNK,
+    AsyncMatches,
+    Game,
+    Matches,
+    simulate_dates,
+    simulate_iter,
+    simulate_many,
+)
+from score_simulator_py.cache import ResultCache
+from score_simulator_py.models import Aggregate, MatchModel
+from score_simulator_py.settings import MAX_AGE
+from score_simulator_py.types import Engine, MatchesTypes, MatchTypes
 
 from .data import matches as matches_data
 
+# 蒙特卡洛模拟的引擎
+SIMULATED = [engine for engine in Engine if engine not in RHO]
+
 
 class TestMatches:
     @pytest.fixture(scope="class")
@@ -26,6 +48,12 @@ class TestMatches:
         yield
         if matches.file.exists():
             matches.file.unlink()
+        if matches.meta_file.exists():
+            matches.meta_file.unlink()
+        if matches.store_file.exists():
+            matches.store_file.unlink()
+        if matches.lock_file.exists():
+            matches.lock_file.unlink()
         if matches.directory.exists():
             matches.directory.rmdir()
 
@@ -122,6 +150,8 @@ class TestMatches:
 
         with pytest.raises(KeyError):
             data["2023-12-09"]
+        # 上游不再包含的日期同样从本地数据中删除
+        assert matches.read() == data
 
     def test_get_today(
         self, matches: Matches, today_matches_data: MatchesTypes, clean: Any
@@ -135,12 +165,244 @@ class TestMatches:
         today = list(today_matches_data.keys())[1]
         assert len(data[today]) == 0
 
+    def test_select_from_store(self, matches: Matches, clean: Any) -> None:
+        matches.save(matches_data)
+        assert matches.store_file.exists()
+        selected = matches.select("2023-12-08")
+        assert selected[0]["home"]["name"] == "Juventus"
+
+    def test_select_rebuilds_store(self, matches: Matches, clean: Any) -> None:
+        matches.save(matches_data)
+        with open(matches.file, "w") as f:
+            json.dump(matches_data | {"2023-12-09": []}, f)
+        assert matches.select("2023-12-09") == []
+
+    def test_legacy_file(self, matches: Matches, clean: Any) -> None:
+        matches.mkdir()
+        with open(matches.file, "w") as f:
+            json.dump(matches_data, f)
+        assert matches.read() == matches_data
+        assert matches.merge(matches_data | {"2023-12-09": []}) == [
+            "2023-12-09"
+        ]
+        # 合并后 store 成为唯一的本地数据
+        assert not matches.file.exists()
+        assert matches.read() == matches_data | {"2023-12-09": []}
+
+    def test_merge(self, matches: Matches, clean: Any) -> None:
+        matches.save(matches_data)
+        assert matches.merge(matches_data) == []
+        assert matches.merge(matches_data | {"2023-12-09": []}) == [
+            "2023-12-09"
+        ]
+        assert matches.read() == matches_data | {"2023-12-09": []}
+        # 上游不再包含的日期被删除
+        assert matches.merge({"2023-12-09": []}) == ["2023-12-08"]
+        assert matches.read() == {"2023-12-09": []}
+
+    def test_select_dates(self, matches: Matches, clean: Any) -> None:
+        data = matches_data | {"2023-12-07": [], "2023-12-09": []}
+        matches.save(data)
+        assert [date for date, _ in matches.select_dates()] == [
+            "2023-12-07",
+            "2023-12-08",
+            "2023-12-09",
+        ]
+        selected = dict(
+            matches.select_dates(start="2023-12-08", end="2023-12-08")
+        )
+        assert selected == {"2023-12-08": matches_data["2023-12-08"]}
+        assert [
+            date for date, _ in matches.select_dates(start="2023-12-08")
+        ] == ["2023-12-08", "2023-12-09"]
+        assert [
+            date
+            for date, _ in matches.select_dates(["2023-12-09", "2023-12-07"])
+        ] == ["2023-12-09", "2023-12-07"]
+        with pytest.raises(KeyError):
+            dict(matches.select_dates(["2023-12-10"]))
+
     def test_select(self, matches: Matches) -> None:
         selected = matches.select(date="2023-12-08", matches=matches_data)
         match = selected[0]
         assert match["home"]["name"] == "Juventus"
 
 
+class TestConditionalFetch:
+    @pytest.fixture
+    def clean(self, matches: Matches) -> Generator[None, Any, None]:
+        yield
+        for file in (
+            matches.file,
+            matches.meta_file,
+            matches.store_file,
+            matches.lock_file,
+        ):
+            if file.exists():
+                file.unlink()
+        if matches.directory.exists():
+            matches.directory.rmdir()
+
+    def test_get_saves_meta(self, matches: Matches, clean: Any) -> None:
+        with respx.mock:
+            respx.get(MATCHES_URL).mock(
+                return_value=Response(
+                    200, json=matches_data, headers={"ETag": '"v1"'}
+                )
+            )
+            matches.get()
+        meta = matches.read_meta()
+        assert meta is not None
+        assert meta["etag"] == '"v1"'
+        assert meta["last_modified"] is None
+        assert matches.is_fresh()
+
+    def test_get_fresh(self, matches: Matches, clean: Any) -> None:
+        matches.save(matches_data)
+        matches.save_meta(
+            {"etag": '"v1"', "last_modified": None, "fetched_at": time.time()}
+        )
+        with respx.mock:
+            route = respx.get(MATCHES_URL)
+            data = matches.get()
+            assert not route.called
+        assert data == matches_data
+
+    def test_get_not_modified(self, matches: Matches, clean: Any) -> None:
+        matches.save(matches_data)
+        matches.save_meta(
+            {
+                "etag": '"v1"',
+                "last_modified": "Fri, 08 Dec 2023 00:00:00 GMT",
+                "fetched_at": time.time() - matches.max_age,
+            }
+        )
+        with respx.mock:
+            route = respx.get(
+                MATCHES_URL, headers={"If-None-Match": '"v1"'}
+            ).mock(return_value=Response(304))
+            data = matches.get()
+            assert route.called
+            request = route.calls.last.request
+            assert "If-Modified-Since" in request.headers
+        assert data == matches_data
+        meta = matches.read_meta()
+        assert meta is not None
+        assert meta["etag"] == '"v1"'
+        assert matches.is_fresh()
+
+    def test_get_modified(self, matches: Matches, clean: Any) -> None:
+        matches.save(matches_data)
+        matches.save_meta(
+            {"etag": '"v1"', "last_modified": None, "fetched_at": 0}
+        )
+        new_data = matches_data | {"2023-12-09": []}
+        with respx.mock:
+            respx.get(MATCHES_URL).mock(
+                return_value=Response(
+                    200, json=new_data, headers={"ETag": '"v2"'}
+                )
+            )
+            data = matches.get()
+        assert "2023-12-09" in data
+        assert "2023-12-09" in matches.read()
+        meta = matches.read_meta()
+        assert meta is not None
+        assert meta["etag"] == '"v2"'
+
+    def test_max_age(self) -> None:
+        assert Matches().max_age == MAX_AGE
+        os.environ["SCORE_SIMULATOR_MAX_AGE"] = "60"
+        try:
+            assert Matches().max_age == 60
+        finally:
+            del os.environ["SCORE_SIMULATOR_MAX_AGE"]
+
+
+class TestAsyncMatches:
+    @pytest.fixture
+    def matches(self) -> AsyncMatches:
+        matches = AsyncMatches(backoff=0)
+        matches.path = str(Path(Path.cwd(), "tests/tmp"))
+        return matches
+
+    @pytest.fixture
+    def clean(self, matches: AsyncMatches) -> Generator[None, Any, None]:
+        yield
+        for file in (
+            matches.file,
+            matches.meta_file,
+            matches.store_file,
+            matches.lock_file,
+        ):
+            if file.exists():
+                file.unlink()
+        if matches.directory.exists():
+            matches.directory.rmdir()
+
+    async def _get(self, matches: AsyncMatches) -> MatchesTypes:
+        async with matches:
+            return await matches.get()
+
+    def test_get(self, matches: AsyncMatches, clean: Any) -> None:
+        with respx.mock:
+            route = respx.get(MATCHES_URL).mock(
+                return_value=Response(
+                    200, json=matches_data, headers={"ETag": '"v1"'}
+                )
+            )
+            data = asyncio.run(self._get(matches))
+            assert route.call_count == 1
+        assert data == matches_data
+        assert matches.select("2023-12-08") == matches_data["2023-12-08"]
+        assert matches.is_fresh()
+
+    def test_get_not_modified(self, matches: AsyncMatches, clean: Any) -> None:
+        matches.save(matches_data)
+        matches.save_meta(
+            {"etag": '"v1"', "last_modified": None, "fetched_at": 0}
+        )
+        with respx.mock:
+            respx.get(MATCHES_URL, headers={"If-None-Match": '"v1"'}).mock(
+                return_value=Response(304)
+            )
+            data = asyncio.run(self._get(matches))
+        assert data == matches_data
+
+    def test_retry(self, matches: AsyncMatches) -> None:
+        with respx.mock:
+            route = respx.get(MATCHES_URL).mock(
+                side_effect=[
+                    httpx.ConnectTimeout("timeout"),
+                    Response(503),
+                    Response(200, json=matches_data),
+                ]
+            )
+            data = asyncio.run(matches.fetch())
+            assert route.call_count == 3
+        assert data == matches_data
+
+    def test_retry_exhausted(self, matches: AsyncMatches) -> None:
+        matches.retries = 1
+        with respx.mock:
+            route = respx.get(MATCHES_URL).mock(return_value=Response(503))
+            with pytest.raises(httpx.HTTPStatusError):
+                asyncio.run(matches.fetch())
+            assert route.call_count == 2
+
+    def test_fetch_many(self, matches: AsyncMatches) -> None:
+        urls = ["https://example.com/1.json", "https://example.com/2.json"]
+        with respx.mock:
+            respx.get(urls[0]).mock(
+                return_value=Response(200, json=matches_data)
+            )
+            respx.get(urls[1]).mock(
+                return_value=Response(200, json={"2023-12-09": []})
+            )
+            data = asyncio.run(matches.fetch_many(urls))
+        assert list(data) == ["2023-12-08", "2023-12-09"]
+
+
 class TestGame:
     @pytest.fixture(scope="class")
     def game(self) -> Game:
@@ -151,6 +413,11 @@ class TestGame:
         xg = game.generate_xg(mu=0.1)
         assert 0 <= xg <= 1
 
+    def test_binomial(self, game: Game) -> None:
+        assert 0 <= game.binomial(90, 0.3) <= 90
+        assert game.binomial(90, 0) == 0
+        assert game.binomial(90, 1) == 90
+
     def test_attack(self, game: Game) -> None:
         frame = game.attack()
         assert frame.home.shot >= 0
@@ -160,8 +427,348 @@ class TestGame:
         assert result.home.score >= 0
         assert result.timing == 90
 
+    @pytest.mark.parametrize("engine", list(RHO))
+    def test_play_exact(self, game: Game, engine: Engine) -> None:
+        with pytest.raises(ValueError):
+            game.play(engine=engine)
+
+    def test_play_events(self, game: Game) -> None:
+        result = game.play(fulltime=120, engine=Engine.events)
+        assert result.timing == 120
+        assert result.home.goal_minutes == sorted(result.home.goal_minutes)
+        assert all(0 <= minute < 120 for minute in result.home.goal_minutes)
+
+    def test_play_events_distribution(self) -> None:
+        # 两种引擎的射门, 进球, 胜平负和进球时间的分布一致
+        match = matches_data["2023-12-08"][0]
+        steps = 10_000
+        events = Game(match, seed=1).simulate(
+            steps=steps, engine=Engine.events
+        )
+        minutes = Game(match, seed=2).simulate(steps=steps)
+
+        def se(aggregate: Aggregate, team: str, stat: str) -> float:
+            return float(
+                getattr(aggregate, team).std(stat, steps) / math.sqrt(steps)
+            )
+
+        for team in ("home", "away"):
+            for stat in ("shots", "score"):
+                difference = (
+                    getattr(getattr(events, team), stat)
+                    - getattr(getattr(minutes, team), stat)
+                ) / steps
+                tolerance = 4 * math.hypot(
+                    se(events, team, stat), se(minutes, team, stat)
+                )
+                assert abs(difference) < tolerance, (team, stat)
+
+        expected = events.distribution()
+        simulated = minutes.distribution()
+        for prob, estimate in zip(expected.outcomes, simulated.outcomes):
+            tolerance = 4 * math.hypot(
+                expected.standard_error(prob), simulated.standard_error(prob)
+            )
+            assert abs(prob - estimate) < tolerance
+
+        # 上半场进球的比例
+        for team in ("home", "away"):
+            shares = []
+            for aggregate in (events, minutes):
+                goal_counts = getattr(aggregate, team).goal_counts
+                shares.append(sum(goal_counts[:45]) / sum(goal_counts))
+            goals = getattr(minutes, team).score
+            assert abs(shares[0] - shares[1]) < 4 * math.sqrt(0.5 / goals)
+
     def test_play_100(self, game: Game) -> None:
         result = game.play_100(steps=2)
         assert result.home.score >= 0
         assert result.timing == 90
         assert result.played
+
+    @pytest.mark.parametrize("engine", SIMULATED)
+    def test_seed(self, engine: Engine) -> None:
+        match = matches_data["2023-12-08"][0]
+        result = Game(match, seed=1).play_100(steps=20, engine=engine)
+        assert Game(match, seed=1).play_100(steps=20, engine=engine) == result
+
+    @pytest.mark.parametrize("engine", SIMULATED)
+    def test_distribution(self, game: Game, engine: Engine) -> None:
+        distribution = game.distribution(steps=500, engine=engine)
+        total = distribution.home_win + distribution.draw
+        assert total + distribution.away_win == pytest.approx(1)
+        assert distribution.steps == 500
+        assert 0 < distribution.max_standard_error < 0.05
+
+    def test_play_from(self, game: Game) -> None:
+        distribution = game.play_from(63, 1, 1)
+        assert distribution.scorelines[0][0] == 0
+        assert distribution.btts == pytest.approx(1)
+        assert distribution.steps is None
+        assert distribution.home_goals > 1
+
+        finished = game.play_from(90, 2, 0)
+        assert finished.home_win == pytest.approx(1)
+
+    def test_play_from_agrees_with_simulation(self, game: Game) -> None:
+        exact = game.play_from(0)
+        simulated = Game(game.model, seed=1).distribution(
+            steps=100_000, engine=Engine.numpy
+        )
+        for prob, estimate in [
+            (exact.home_win, simulated.home_win),
+            (exact.draw, simulated.draw),
+            (exact.away_win, simulated.away_win),
+        ]:
+            assert abs(prob - estimate) < 4 * simulated.standard_error(prob)
+
+    @pytest.mark.parametrize("engine", list(RHO))
+    def test_distribution_exact(self, game: Game, engine: Engine) -> None:
+        distribution = game.distribution(engine=engine)
+        total = distribution.home_win + distribution.draw
+        assert total + distribution.away_win == pytest.approx(1)
+        assert distribution.steps is None
+        assert distribution.max_standard_error == 0
+        result = game.play_100(engine=engine)
+        assert result.home.score == int(distribution.home_goals)
+        assert result.played
+
+    def test_poisson_agrees_with_simulation(self, game: Game) -> None:
+        exact = game.distribution(engine=Engine.poisson)
+        simulated = Game(game.model, seed=1).distribution(
+            steps=100_000, engine=Engine.numpy
+        )
+        for prob, estimate in [
+            (exact.home_win, simulated.home_win),
+            (exact.draw, simulated.draw),
+            (exact.away_win, simulated.away_win),
+            (exact.over(2.5), simulated.over(2.5)),
+        ]:
+            assert abs(prob - estimate) < 4 * simulated.standard_error(prob)
+        assert exact.home_goals == pytest.approx(simulated.home_goals, 0.02)
+
+    def test_play_from_invalid(self, game: Game) -> None:
+        with pytest.raises(ValueError):
+            game.play_from(91)
+        with pytest.raises(ValueError):
+            game.play_from(10, -1, 0)
+
+    def test_antithetic(self) -> None:
+        match = matches_data["2023-12-08"][0]
+        aggregate = Game(match, seed=1).simulate(
+            steps=1001, engine=Engine.numpy, antithetic=True
+        )
+        assert aggregate.steps == 1001
+        assert aggregate.pairs == 500
+        assert aggregate == Game(match, seed=1).simulate(
+            steps=1001, engine=Engine.numpy, antithetic=True
+        )
+        distribution = aggregate.distribution()
+        assert distribution.variance_ratios is not None
+        assert distribution.variance_reduction is not None
+        assert distribution.variance_reduction > 0
+        with pytest.raises(ValueError):
+            Game(match).simulate(steps=10, antithetic=True)
+
+    def test_compare(self) -> None:
+        match = matches_data["2023-12-08"][0]
+        comparison = Game(match, seed=1).compare(
+            MatchModel.from_match(match, {"home_xg": 1.2}), steps=5000
+        )
+        assert comparison.units == 5000
+        home_win, _, away_win = comparison.difference
+        assert home_win > 0 > away_win
+        # 共用随机数时差值的噪声远小于分别模拟
+        for se, independent in zip(
+            comparison.standard_errors,
+            comparison.independent_standard_errors,
+        ):
+            assert 0 < se < independent
+        home_win, _, away_win = comparison.variance_reduction
+        assert home_win > 4 and away_win > 4
+
+        same = Game(match, seed=1).compare(match, steps=1000, antithetic=True)
+        assert same.units == 500
+        assert same.difference == [0, 0, 0]
+        assert same.standard_errors == [0, 0, 0]
+        # xg 另外抽样, 比分完全相同
+        assert same.base.scorelines == same.other.scorelines
+
+    def test_play_100_numpy(self, game: Game) -> None:
+        result = game.play_100(steps=1000, engine=Engine.numpy)
+        assert 0 < result.home.shots < 30
+        assert 0 < result.away.xg < 5
+        assert len(result.home.goal_minutes) == result.home.score
+        assert result.timing == 90
+        assert result.played
+
+
+class TestSimulateMany:
+    @pytest.fixture(scope="class")
+    def selected(self) -> list[MatchTypes]:
+        return matches_data["2023-12-08"] * 3
+
+    def test_serial(self, selected: list[MatchTypes]) -> None:
+        aggregates = simulate_many(selected, steps=2)
+        assert len(aggregates) == 3
+        assert aggregates[0].steps == 2
+        result = aggregates[0].mean()
+        assert result.home.name == "Juventus"
+        assert result.timing == 90
+        assert result.played
+
+    def test_workers(self, selected: list[MatchTypes]) -> None:
+        steps = STEPS_PER_CHUNK * 2 + 1
+        aggregates = simulate_many(
+            selected, steps=steps, workers=2, engine=Engine.numpy
+        )
+        assert len(aggregates) == 3
+        for aggregate in aggregates:
+            assert aggregate.steps == steps
+            result = aggregate.mean()
+            assert 0 < result.home.shots < 30
+            assert len(result.away.goal_minutes) == result.away.score
+
+    def test_seed(self, selected: list[MatchTypes]) -> None:
+        steps = STEPS_PER_CHUNK + 1
+        serial = simulate_many(selected, steps, engine=Engine.numpy, seed=1)
+        parallel = simulate_many(
+            selected, steps, workers=2, engine=Engine.numpy, seed=1
+        )
+        assert serial == parallel
+
+    def test_target_se(self, selected: list[MatchTypes]) -> None:
+        steps = STEPS_PER_CHUNK * 100
+        aggregates = simulate_many(
+            selected, steps, engine=Engine.numpy, seed=1, target_se=0.01
+        )
+        for aggregate in aggregates:
+            assert STEPS_PER_CHUNK <= aggregate.steps < steps
+            assert aggregate.steps % STEPS_PER_CHUNK == 0
+            assert aggregate.distribution().max_standard_error <= 0.01
+
+        parallel = simulate_many(
+            selected,
+            steps,
+            workers=2,
+            engine=Engine.numpy,
+            seed=1,
+            target_se=0.01,
+        )
+        assert parallel == aggregates
+
+    def test_target_se_cap(self, selected: list[MatchTypes]) -> None:
+        aggregates = simulate_many(
+            selected, 10, engine=Engine.numpy, target_se=0.001
+        )
+        assert all(aggregate.steps == 10 for aggregate in aggregates)
+
+    def test_empty(self) -> None:
+        assert simulate_many([], steps=2, workers=2) == []
+
+    def test_exact(self, selected: list[MatchTypes]) -> None:
+        aggregates = simulate_many(
+            selected, 1000, workers=2, engine=Engine.dixon_coles, seed=1
+        )
+        assert len(aggregates) == 3
+        assert all(aggregate.exact for aggregate in aggregates)
+        assert aggregates[0] == Game(selected[0]).simulate(
+            engine=Engine.dixon_coles
+        )
+
+    def test_cache(self, selected: list[MatchTypes], tmp_path: Path) -> None:
+        cache = ResultCache(tmp_path)
+        first = simulate_many(
+            selected, 10, engine=Engine.numpy, seed=1, cache=cache
+        )
+        assert len(list(tmp_path.glob("*.json"))) == 1
+        assert simulate_many(selected, 10, engine=Engine.numpy, seed=1) == (
+            first
+        )
+        with metrics.profiling() as profile:
+            second = simulate_many(
+                selected, 10, engine=Engine.numpy, seed=1, cache=cache
+            )
+        assert second == first
+        assert profile.counters == {"results.hit": 3}
+
+    def test_cache_evict(
+        self,
+        selected: list[MatchTypes],
+        tmp_path: Path,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        # 每次模拟只淘汰一次, 全部命中时不淘汰
+        calls = []
+        monkeypatch.setattr(
+            ResultCache, "evict", lambda self: calls.append(self)
+        )
+        cache = ResultCache(tmp_path)
+        simulate_many(selected, 10, engine=Engine.numpy, seed=1, cache=cache)
+        assert calls == [cache]
+        simulate_many(selected, 10, engine=Engine.numpy, seed=1, cache=cache)
+        assert calls == [cache]
+
+    def test_antithetic(self, selected: list[MatchTypes]) -> None:
+        steps = STEPS_PER_CHUNK * 2 + 1
+        serial = simulate_many(
+            selected, steps, engine=Engine.numpy, seed=1, antithetic=True
+        )
+        parallel = simulate_many(
+            selected,
+            steps,
+            workers=2,
+            engine=Engine.numpy,
+            seed=1,
+            antithetic=True,
+        )
+        assert serial == parallel
+        assert serial[0].pairs == steps // 2
+        assert (
+            serial[0]
+            != simulate_many(selected, steps, engine=Engine.numpy, seed=1)[0]
+        )
+
+    def test_cache_without_seed(
+        self, selected: list[MatchTypes], tmp_path: Path
+    ) -> None:
+        simulate_many(selected, 10, cache=ResultCache(tmp_path))
+        assert list(tmp_path.iterdir()) == []
+
+    def test_iter(self, selected: list[MatchTypes]) -> None:
+        results = simulate_iter(selected, 10, engine=Engine.numpy, seed=1)
+        index, aggregate = next(results)
+        assert index == 0
+        assert aggregate.steps == 10
+        assert [index for index, _ in results] == [1, 2]
+        assert dict(
+            simulate_iter(selected, 10, engine=Engine.numpy, seed=1)
+        ) == dict(
+            enumerate(simulate_many(selected, 10, engine=Engine.numpy, seed=1))
+        )
+
+    def test_dates(self, selected: list[MatchTypes]) -> None:
+        dated: list[tuple[str, list[MatchTypes]]] = [
+            ("2023-12-08", selected),
+            ("2023-12-09", []),
+            ("2023-12-10", selected[:1]),
+        ]
+        results = list(
+            simulate_dates(
+                dated, 10, engine=Engine.numpy, seed=1, batch_size=2
+            )
+        )
+        assert [date for date, _, _ in results] == ["2023-12-08"] * 3 + [
+            "2023-12-10"
+        ]
+        assert all(
+            match["name"] == "Juventus vs Napoli" for _, match, _ in results
+        )
+        # 与单独模拟某一天的结果相同
+        assert [aggregate for _, _, aggregate in results[:3]] == simulate_many(
+            selected, 10, engine=Engine.numpy, seed=1
+        )
+        parallel = simulate_dates(
+            dated, 10, workers=2, engine=Engine.numpy, seed=1
+        )
+        assert list(parallel) == results
@@ -0,0 +1,66 @@
+import json
+from pathlib import Path
+
+from typer.testing import CliRunner
+
+from score_simulator_py import bench
+from score_simulator_py.cli import app
+from score_simulator_py.types import Engine
+
+
+def test_measure() -> None:
+    result = bench.measure("sum", lambda: sum(range(1000)), 10, 900)
+    assert result["name"] == "sum"
+    assert result["seconds"] > 0
+    assert result["sims_per_sec"] is not None
+    assert result["ns_per_minute"] is not None
+    assert result["peak_bytes"] >= 0
+
+    result = bench.measure("noop", lambda: None)
+    assert result["sims_per_sec"] is None
+    assert result["ns_per_minute"] is None
+
+
+def test_synthetic_matches() -> None:
+    data = bench.synthetic_matches(1, per_day=2)
+    assert len(data) == 365
+    assert all(len(matches) == 2 for matches in data.values())
+
+
+def test_run() -> None:
+    results = bench.run([10], [Engine.numpy], seasons=1, calls=10)
+    names = [result["name"] for result in results]
+    assert names == [
+        "Game.attack",
+        "Game.play",
+        "Game.play_100[numpy, steps=10]",
+        "Result.__add__",
+        "Result._divide",
+        "Matches.read[seasons=1]",
+        "Matches.select[seasons=1]",
+    ]
+
+
+def test_cli(tmp_path: Path) -> None:
+    output = tmp_path / "bench.json"
+    result = CliRunner().invoke(
+        app,
+        [
+            "bench",
+            "--steps",
+            "10",
+            "--engine",
+            "events",
+            "--seasons",
+            "1",
+            "--calls",
+            "10",
+            "--output",
+            str(output),
+        ],
+    )
+    assert result.exit_code == 0
+    assert "Game.play_100[events, steps=10]" in result.stdout
+    report = json.loads(output.read_text())
+    assert report["environment"]["python"]
+    assert len(report["results"]) == 7
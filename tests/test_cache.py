@@ -0,0 +1,70 @@
+import copy
+import os
+from pathlib import Path
+
+import pytest
+
+from score_simulator_py import cache
+from score_simulator_py.api import Game
+from score_simulator_py.cache import ResultCache
+from score_simulator_py.models import Aggregate
+from score_simulator_py.types import Engine, MatchTypes
+
+from .data import matches as matches_data
+
+
+@pytest.fixture
+def match() -> MatchTypes:
+    return copy.deepcopy(matches_data["2023-12-08"][0])
+
+
+@pytest.fixture
+def aggregate(match: MatchTypes) -> Aggregate:
+    return Game(match, seed=1).simulate(steps=10)
+
+
+class TestResultCache:
+    def test_dump(self, aggregate: Aggregate) -> None:
+        assert cache.load(cache.dump(aggregate)) == aggregate
+        antithetic = Game(matches_data["2023-12-08"][0], seed=1).simulate(
+            steps=10, engine=Engine.numpy, antithetic=True
+        )
+        assert cache.load(cache.dump(antithetic)) == antithetic
+
+    def test_key(self, match: MatchTypes) -> None:
+        key = ResultCache.key(match, 90, 100, Engine.python, 1)
+        assert key == ResultCache.key(match, 90, 100, Engine.python, 1)
+        assert key != ResultCache.key(match, 90, 100, Engine.python, 2)
+        assert key != ResultCache.key(match, 90, 100, Engine.numpy, 1)
+        assert key != ResultCache.key(match, 90, 10, Engine.python, 1)
+        assert key != ResultCache.key(match, 80, 100, Engine.python, 1)
+        assert key != ResultCache.key(match, 90, 100, Engine.python, 1, 0.01)
+        assert key != ResultCache.key(
+            match, 90, 100, Engine.numpy, 1, antithetic=True
+        )
+        match["home"]["shots"] += 1
+        assert key != ResultCache.key(match, 90, 100, Engine.python, 1)
+
+    def test_get(self, aggregate: Aggregate, tmp_path: Path) -> None:
+        results = ResultCache(tmp_path / "results")
+        assert results.get("a") is None
+        results.put("a", aggregate)
+        assert results.get("a") == aggregate
+        results.file("a").write_text("{")
+        assert results.get("a") is None
+        results.clear()
+        assert list(results.directory.iterdir()) == []
+
+    def test_evict(self, aggregate: Aggregate, tmp_path: Path) -> None:
+        size = len(cache.dump(aggregate))
+        results = ResultCache(tmp_path, max_size=size * 2)
+        results.put("a", aggregate)
+        results.put("b", aggregate)
+        # 让 a 比 b 更早被使用, 再读取 a 使 b 成为最久未使用的结果
+        os.utime(results.file("a"), ns=(0, 0))
+        os.utime(results.file("b"), ns=(1, 1))
+        assert results.get("a") is not None
+        results.put("c", aggregate)
+        assert len(list(tmp_path.iterdir())) == 3
+        results.evict()
+        assert sorted(file.stem for file in tmp_path.iterdir()) == ["a", "c"]
@@ -1,3 +1,9 @@
+import csv
+import io
+import json
+import shutil
+from datetime import date as datelib
+from pathlib import Path
 from typing import Any, Generator
 
 import pytest
@@ -18,6 +24,14 @@ def env(
     yield
     if matches.file.exists():
         matches.file.unlink()
+    if matches.meta_file.exists():
+        matches.meta_file.unlink()
+    if matches.store_file.exists():
+        matches.store_file.unlink()
+    if matches.lock_file.exists():
+        matches.lock_file.unlink()
+    if matches.results.directory.exists():
+        shutil.rmtree(matches.results.directory)
     if matches.directory.exists():
         matches.directory.rmdir()
 
@@ -31,8 +45,195 @@ def test_version() -> None:
 def test_play(env: Any) -> None:
     result = runner.invoke(app, ["play"])
     assert result.exit_code == 0
+    for engine in ("poisson", "dixon_coles"):
+        result = runner.invoke(app, ["play", f"--engine={engine}"])
+        assert result.exit_code != 0
 
 
 def test_play_100(env: Any) -> None:
     result = runner.invoke(app, ["play_100", "--steps=2"])
     assert result.exit_code == 0
+
+
+def test_play_100_numpy(env: Any) -> None:
+    result = runner.invoke(app, ["play_100", "--steps=2", "--engine=numpy"])
+    assert result.exit_code == 0
+
+
+def test_play_100_exact(env: Any) -> None:
+    args = [
+        "play_100",
+        "--date=2023-12-08",
+        "--engine=dixon_coles",
+        "--target-se=0.01",
+        "--distribution",
+    ]
+    result = runner.invoke(app, args)
+    assert result.exit_code == 0
+    assert "exact" in result.stdout
+    assert "W/D/L" in result.stdout
+
+
+def test_play_100_workers(env: Any) -> None:
+    result = runner.invoke(app, ["play_100", "--steps=2", "--workers=2"])
+    assert result.exit_code == 0
+
+
+def test_play_100_seed(env: Any) -> None:
+    args = ["play_100", "--steps=2", "--seed=1"]
+    assert runner.invoke(app, args).stdout == runner.invoke(app, args).stdout
+
+
+def test_play_100_distribution(env: Any) -> None:
+    args = ["play_100", "--steps=2", "--distribution"]
+    result = runner.invoke(app, args)
+    assert result.exit_code == 0
+
+
+def test_play_100_target_se(env: Any) -> None:
+    args = ["play_100", "--steps=2000", "--target-se=0.5", "--engine=numpy"]
+    result = runner.invoke(app, args)
+    assert result.exit_code == 0
+
+
+def test_play_from(env: Any) -> None:
+    args = ["play_from", "63", "--home-score=1", "--away-score=1"]
+    result = runner.invoke(app, args)
+    assert result.exit_code == 0
+
+
+def test_play_100_profile(env: Any, tmp_path: Path) -> None:
+    output = tmp_path / "profile.json"
+    result = runner.invoke(
+        app,
+        [
+            "play_100",
+            "--date=2023-12-08",
+            "--steps=2",
+            "--profile",
+            f"--profile-output={output}",
+        ],
+    )
+    assert result.exit_code == 0
+    profile = json.loads(output.read_text())
+    assert "simulate" in profile["phases"]
+    assert profile["counters"]["simulations"] > 0
+
+
+def test_play_100_antithetic(env: Any) -> None:
+    args = ["play_100", "--date=2023-12-08", "--steps=1000", "--antithetic"]
+    assert runner.invoke(app, args).exit_code != 0
+    result = runner.invoke(app, [*args, "--engine=numpy"])
+    assert result.exit_code == 0
+    assert "variance reduction" in result.stdout
+
+
+def test_compare(env: Any) -> None:
+    args = [
+        "compare",
+        "Juventus vs Napoli",
+        "--date=2023-12-08",
+        "--home-xg=1.1",
+        "--steps=2000",
+        "--seed=1",
+    ]
+    result = runner.invoke(app, args)
+    assert result.exit_code == 0
+    assert "scenario" in result.stdout
+    assert "variance reduction" in result.stdout
+    assert runner.invoke(app, args).stdout == result.stdout
+
+    result = runner.invoke(app, ["compare", "Napoli vs Juventus"])
+    assert result.exit_code != 0
+
+
+def test_sweep(env: Any) -> None:
+    args = [
+        "sweep",
+        "Juventus vs Napoli",
+        "--date=2023-12-08",
+        "--home-xg=0.8:1.2:3",
+        "--away-xg=0.9,1.1",
+        "--steps=1000",
+        "--seed=1",
+    ]
+    result = runner.invoke(app, args)
+    assert result.exit_code == 0
+    assert len(result.stdout.splitlines()) == 2 + 6
+    assert "home_xg" in result.stdout
+
+    result = runner.invoke(app, [*args, "--format=csv"])
+    rows = list(csv.DictReader(io.StringIO(result.stdout)))
+    assert len(rows) == 6
+    assert float(rows[0]["home_xg"]) == 0.8
+
+    assert runner.invoke(app, [*args, "--home-shots=1:2:0"]).exit_code != 0
+    result = runner.invoke(app, ["sweep", "Napoli vs Juventus"])
+    assert result.exit_code != 0
+
+
+def test_season(env: Any) -> None:
+    result = runner.invoke(app, ["season", "Serie A", "--seasons=10"])
+    assert result.exit_code == 0
+    assert "1. Juventus" in result.stdout
+    result = runner.invoke(
+        app, ["season", "Serie A", "--seasons=10", "--from=2023-12-09"]
+    )
+    assert result.exit_code != 0
+
+
+def test_play_100_cache(env: Any, matches: Matches) -> None:
+    args = ["play_100", "--date=2023-12-08", "--steps=2", "--seed=7"]
+    first = runner.invoke(app, [*args, "--no-cache"])
+    assert not matches.results.directory.exists() or not any(
+        matches.results.directory.iterdir()
+    )
+    assert runner.invoke(app, args).stdout == first.stdout
+    assert len(list(matches.results.directory.iterdir())) == 1
+    assert runner.invoke(app, args).stdout == first.stdout
+
+
+@pytest.mark.parametrize("format", ["json", "jsonl", "csv"])
+def test_play_100_format(env: Any, format: str) -> None:
+    result = runner.invoke(
+        app,
+        ["play_100", "--date=2023-12-08", "--steps=2", f"--format={format}"],
+    )
+    assert result.exit_code == 0
+    assert "Juventus" in result.stdout
+    if format == "json":
+        assert json.loads(result.stdout)[0]["home"] == "Juventus"
+
+
+def test_play_output(env: Any, tmp_path: Path) -> None:
+    output = tmp_path / "results.jsonl"
+    result = runner.invoke(
+        app,
+        ["play", "--date=2023-12-08", "--format=jsonl", f"--output={output}"],
+    )
+    assert result.exit_code == 0
+    assert result.stdout == ""
+    (line,) = output.read_text().splitlines()
+    assert json.loads(line)["away"] == "Napoli"
+
+
+def test_play_dates(env: Any) -> None:
+    today = datelib.today().strftime("%Y-%m-%d")
+    result = runner.invoke(
+        app, ["play", "--date=2023-12-08", f"--date={today}", "--seed=1"]
+    )
+    assert result.exit_code == 0
+    assert result.stdout.startswith("2023-12-08\nSerie A - Juventus")
+    # 没有比赛的日期不输出
+    assert today not in result.stdout
+
+    result = runner.invoke(
+        app, ["play_100", "--from=2023-12-01", "--to=2023-12-31", "--steps=2"]
+    )
+    assert result.exit_code == 0
+    assert result.stdout.splitlines()[0] == "2023-12-08"
+
+    result = runner.invoke(
+        app, ["play", "--date=2023-12-08", "--from=2023-12-01"]
+    )
+    assert result.exit_code != 0
@@ -0,0 +1,110 @@
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Generator
+
+import pytest
+
+from score_simulator_py.files import FileLock, atomic_write
+
+from .data import matches as matches_data
+
+ROOT = Path(__file__).parent.parent
+PROCESSES = 8
+
+GET = """
+from score_simulator_py.api import Matches
+
+assert Matches().get()["2023-12-08"][0]["home"]["name"] == "Juventus"
+"""
+
+
+def test_atomic_write(tmp_path: Path) -> None:
+    file = Path(tmp_path, "a.json")
+    atomic_write(file, "{}")
+    assert file.read_text() == "{}"
+    atomic_write(file, b"[]")
+    assert file.read_bytes() == b"[]"
+    assert os.listdir(tmp_path) == ["a.json"]
+
+
+def test_file_lock(tmp_path: Path) -> None:
+    file = Path(tmp_path, "a.lock")
+    with FileLock(file) as lock:
+        assert lock.locked
+        assert not FileLock(file).acquire(blocking=False)
+    assert not lock.locked
+    other = FileLock(file)
+    assert other.acquire(blocking=False)
+    other.release()
+
+
+class Handler(BaseHTTPRequestHandler):
+    """模拟数据源, 记录下载次数, 每次下载都比较慢"""
+
+    downloads = 0
+
+    def do_GET(self) -> None:
+        type(self).downloads += 1
+        time.sleep(0.5)
+        content = json.dumps(self.server.data).encode()  # type: ignore
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+
+@pytest.fixture
+def url() -> Generator[str, Any, None]:
+    Handler.downloads = 0
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    today = time.strftime("%Y-%m-%d")
+    server.data = matches_data | {today: []}  # type: ignore
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}/matches.json"
+    server.shutdown()
+    server.server_close()
+
+
+def run(tmp_path: Path, url: str) -> None:
+    env = {
+        key: value
+        for key, value in os.environ.items()
+        if "proxy" not in key.lower()
+    }
+    env |= {
+        "PYTHONPATH": str(ROOT),
+        "SCORE_SIMULATOR_DATA": str(tmp_path),
+        "SCORE_SIMULATOR_URL": url,
+    }
+    processes = [
+        subprocess.Popen([sys.executable, "-c", GET], cwd=tmp_path, env=env)
+        for _ in range(PROCESSES)
+    ]
+    assert all(process.wait(timeout=60) == 0 for process in processes)
+
+
+def test_single_download(tmp_path: Path, url: str) -> None:
+    # 没有本地数据时其他进程等待第一个进程下载完成
+    run(tmp_path, url)
+    assert Handler.downloads == 1
+
+
+def test_single_download_stale(tmp_path: Path, url: str) -> None:
+    # 本地数据过期时只有一个进程更新, 其他进程等待或使用旧数据
+    Path(tmp_path, "matches.json").write_text(json.dumps(matches_data))
+    Path(tmp_path, "matches.meta.json").write_text(
+        json.dumps({"etag": None, "last_modified": None, "fetched_at": 0})
+    )
+    run(tmp_path, url)
+    assert Handler.downloads == 1
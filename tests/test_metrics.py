@@ -0,0 +1,66 @@
+from score_simulator_py import metrics
+from score_simulator_py.api import Game, Matches
+from score_simulator_py.types import Engine, MatchesTypes
+
+from .data import matches as matches_data
+
+
+class TestMetrics:
+    def test_disabled(self) -> None:
+        with metrics.phase("noop"):
+            metrics.count("noop")
+        assert metrics._active is None
+
+    def test_profiling(self) -> None:
+        with metrics.profiling() as profile:
+            with metrics.phase("a"):
+                metrics.count("n", 2)
+            with metrics.phase("a"):
+                metrics.count("n")
+        assert metrics._active is None
+        assert profile.counters == {"n": 3}
+        assert set(profile.phases) == {"a", "total"}
+        assert profile.phases["total"] >= profile.phases["a"]
+        assert "total" in profile.report()
+
+    def test_hook(self) -> None:
+        profiles: list[metrics.Profile] = []
+        metrics.add_hook(profiles.append)
+        try:
+            with metrics.profiling() as profile:
+                metrics.count("n")
+        finally:
+            metrics.remove_hook(profiles.append)
+        assert profiles == [profile]
+
+    def test_simulate(self) -> None:
+        match = matches_data["2023-12-08"][0]
+        with metrics.profiling() as profile:
+            aggregate = Game(match, seed=1).simulate(steps=10)
+            Game(match, seed=1).simulate(steps=10, engine=Engine.numpy)
+        assert profile.counters["simulations"] == 20
+        assert profile.counters["minutes"] == 20 * 90
+        assert profile.counters["shots"] >= (
+            aggregate.home.shots + aggregate.away.shots
+        )
+
+    def test_cache(
+        self, matches: Matches, today_matches_data: MatchesTypes
+    ) -> None:
+        matches.save(today_matches_data)
+        try:
+            with metrics.profiling() as profile:
+                matches.get()
+            assert profile.counters["cache.hit"] == 1
+            assert "matches.read" in profile.phases
+        finally:
+            for file in (
+                matches.file,
+                matches.store_file,
+                matches.meta_file,
+                matches.lock_file,
+            ):
+                if file.exists():
+                    file.unlink()
+            if matches.directory.exists():
+                matches.directory.rmdir()
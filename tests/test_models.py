@@ -1,6 +1,20 @@
+import math
+import pickle
+
 import pytest
 
-from score_simulator_py.models import Result, ResultTeam
+from score_simulator_py.models import (
+    MAX_GOALS,
+    Aggregate,
+    Distribution,
+    MatchModel,
+    Result,
+    ResultTeam,
+    TeamAggregate,
+)
+from score_simulator_py.types import MatchTypes
+
+from .data import matches as matches_data
 
 
 def test_result_team() -> None:
@@ -63,6 +77,7 @@ class TestResult:
         new_result = result + result_2
         assert new_result.home.shots == 26
         assert int(new_result.away.xg * 10) == 12
+        assert int(new_result.home.xg * 10) == 18
         assert new_result.home.score == 3
         assert new_result.home.goal_minutes == [2, 89, 89]
 
@@ -87,3 +102,202 @@ class TestResult:
         truediv_result = result / 2
         floordiv_result = result // 2
         assert truediv_result.home.shots == floordiv_result.home.shots
+
+
+class TestMatchModel:
+    @pytest.fixture
+    def match(self) -> MatchTypes:
+        return matches_data["2023-12-08"][0]
+
+    def test_from_match(self, match: MatchTypes) -> None:
+        model = MatchModel.from_match(match)
+        assert model.home_name == "Juventus"
+        assert model.competition == "Serie A"
+        assert model.home_xg_per_shot == 22.7 / 195
+        assert model.home_shot_percentage == 195 / (195 + 242)
+        assert model.shot_prob_per_minute == (195 + 242) / 15 / 90
+
+    def test_from_match_factors(self, match: MatchTypes) -> None:
+        model = MatchModel.from_match(match, {"home_xg": 1.1})
+        assert model.home_xg_per_shot == pytest.approx(22.7 * 1.1 / 195)
+        assert (
+            model.away_xg_per_shot
+            == MatchModel.from_match(match).away_xg_per_shot
+        )
+        model = MatchModel.from_match(match, {"away_shots": 0.5})
+        assert model.home_shot_percentage == 195 / (195 + 121)
+        with pytest.raises(ValueError):
+            MatchModel.from_match(match, {"home_goals": 2})
+        with pytest.raises(ValueError):
+            MatchModel.from_match(match, {"home_played": 0})
+
+    @pytest.mark.parametrize("key", ["shots", "played"])
+    def test_from_match_zero(self, match: MatchTypes, key: str) -> None:
+        invalid = match | {"away": match["away"] | {key: 0}}
+        with pytest.raises(ValueError):
+            MatchModel.from_match(invalid)  # type: ignore[arg-type]
+
+    def test_pickle(self, match: MatchTypes) -> None:
+        model = MatchModel.from_match(match)
+        assert pickle.loads(pickle.dumps(model)) == model
+
+    def test_new_result(self, match: MatchTypes) -> None:
+        result = MatchModel.from_match(match).new_result(timing=90)
+        assert result.away.name == "Napoli"
+        assert result.timing == 90
+        assert not result.played
+
+
+class TestAggregate:
+    @pytest.fixture
+    def results(self) -> list[Result]:
+        return [
+            Result(
+                home=ResultTeam("Arsenal", 20, 2, 1.2, goal_minutes=[2, 89]),
+                away=ResultTeam("Man City", 12, 1, 0.8, goal_minutes=[47]),
+                competition="Premier League",
+                timing=90,
+                played=True,
+            ),
+            Result(
+                home=ResultTeam("Arsenal", 6, 1, 0.6, goal_minutes=[89]),
+                away=ResultTeam("Man City", 4, 0, 0.4),
+                competition="Premier League",
+                timing=90,
+                played=True,
+            ),
+        ]
+
+    @pytest.fixture
+    def aggregate(self) -> Aggregate:
+        return Aggregate(
+            home=TeamAggregate("Arsenal", goal_counts=[0] * 90),
+            away=TeamAggregate("Man City", goal_counts=[0] * 90),
+            competition="Premier League",
+        )
+
+    def test_add(self, aggregate: Aggregate, results: list[Result]) -> None:
+        for result in results:
+            aggregate.add(result)
+        assert aggregate.steps == 2
+        assert aggregate.home.shots == 26
+        assert aggregate.home.shots_sq == 20**2 + 6**2
+        assert int(aggregate.home.xg * 10) == 18
+        assert aggregate.home.goal_counts[89] == 2
+        assert len(aggregate.home.goal_counts) == 90
+
+    def test_merge(self, aggregate: Aggregate, results: list[Result]) -> None:
+        other = Aggregate(
+            home=TeamAggregate("Arsenal", goal_counts=[0] * 90),
+            away=TeamAggregate("Man City", goal_counts=[0] * 90),
+            competition="Premier League",
+        )
+        aggregate.add(results[0])
+        other.add(results[1])
+        merged = aggregate + other
+        assert merged.steps == 2
+        assert merged.away.score == 1
+        assert merged.home.goal_counts[89] == 2
+
+    def test_mean(self, aggregate: Aggregate, results: list[Result]) -> None:
+        for result in results:
+            aggregate.add(result)
+        total = sum(results[1:], results[0])
+        assert aggregate.mean() == total / 2
+
+    def test_scorelines(
+        self, aggregate: Aggregate, results: list[Result]
+    ) -> None:
+        for result in results:
+            aggregate.add(result)
+        assert aggregate.scorelines[2][1] == 1
+        assert aggregate.scorelines[1][0] == 1
+        merged = aggregate + aggregate
+        assert merged.scorelines[2][1] == 2
+
+        distribution = aggregate.distribution()
+        assert distribution.home_win == 1
+        assert distribution.home_goals == 1.5
+        assert distribution.steps == 2
+        assert distribution.variance_ratios is None
+
+    def test_pairs(self, aggregate: Aggregate) -> None:
+        # 两对结果, 每对都是一场 1:0 一场 0:1, 主胜概率的估计没有方差
+        aggregate.steps = 4
+        aggregate.scorelines[1][0] = 2
+        aggregate.scorelines[0][1] = 2
+        aggregate.pairs = 2
+        aggregate.pair_sq = [2, 0, 2]
+        merged = aggregate + aggregate
+        assert merged.pairs == 4
+        assert merged.pair_sq == [4, 0, 4]
+        distribution = aggregate.distribution()
+        assert distribution.home_win == 0.5
+        assert distribution.variance_ratios == [0, 1, 0]
+        assert distribution.max_standard_error == 0
+        assert distribution.variance_reduction == 1
+
+    def test_std(self, aggregate: Aggregate, results: list[Result]) -> None:
+        assert aggregate.home.std("score", aggregate.steps) == 0
+        for result in results:
+            aggregate.add(result)
+        assert aggregate.home.std("shots", 2) == pytest.approx(9.899, 1e-3)
+
+
+class TestDistribution:
+    @pytest.fixture(scope="class")
+    def distribution(self) -> Distribution:
+        scorelines = [[0.0] * (MAX_GOALS + 1) for _ in range(MAX_GOALS + 1)]
+        scorelines[0][0] = 0.1
+        scorelines[1][1] = 0.2
+        scorelines[2][1] = 0.3
+        scorelines[0][3] = 0.4
+        return Distribution(
+            home="Arsenal",
+            away="Man City",
+            competition="Premier League",
+            scorelines=scorelines,
+            steps=100,
+        )
+
+    def test_outcomes(self, distribution: Distribution) -> None:
+        assert distribution.home_win == pytest.approx(0.3)
+        assert distribution.draw == pytest.approx(0.3)
+        assert distribution.away_win == pytest.approx(0.4)
+        assert distribution.btts == pytest.approx(0.5)
+        assert distribution.over(2.5) == pytest.approx(0.7)
+        assert distribution.under(2.5) == pytest.approx(0.3)
+
+    def test_standard_error(self, distribution: Distribution) -> None:
+        assert distribution.standard_error(0.5) == pytest.approx(0.05)
+        assert distribution.max_standard_error == pytest.approx(
+            math.sqrt(0.4 * 0.6 / 100)
+        )
+
+    def test_variance_ratios(self, distribution: Distribution) -> None:
+        reduced = Distribution(
+            home="Arsenal",
+            away="Man City",
+            competition="Premier League",
+            scorelines=distribution.scorelines,
+            steps=100,
+            variance_ratios=[0.25, 0.5, 1.0],
+        )
+        assert reduced.standard_errors[0] == pytest.approx(
+            distribution.standard_error(0.3) / 2
+        )
+        assert reduced.standard_errors[2] == distribution.standard_errors[2]
+        assert reduced.variance_reduction == 1
+        assert distribution.variance_reduction is None
+
+    def test_exact(self, distribution: Distribution) -> None:
+        exact = Distribution(
+            home="Arsenal",
+            away="Man City",
+            competition="Premier League",
+            scorelines=distribution.scorelines,
+        )
+        assert exact.max_standard_error == 0
+
+    def test_top_scorelines(self, distribution: Distribution) -> None:
+        assert distribution.top_scorelines(2) == [(0, 3, 0.4), (2, 1, 0.3)]
@@ -0,0 +1,67 @@
+import csv
+import io
+import json
+
+import pytest
+
+from score_simulator_py.api import Game
+from score_simulator_py.models import Aggregate
+from score_simulator_py.output import FIELDS, Writer, record, writer
+from score_simulator_py.types import Format
+
+from .data import matches as matches_data
+
+
+@pytest.fixture
+def aggregate() -> Aggregate:
+    return Game(matches_data["2023-12-08"][0], seed=1).simulate(steps=10)
+
+
+class TestOutput:
+    def test_record(self, aggregate: Aggregate) -> None:
+        result = record(aggregate, "2023-12-08")
+        assert list(result) == FIELDS
+        assert result["date"] == "2023-12-08"
+        assert result["home"] == "Juventus"
+        assert result["steps"] == 10
+        assert len(result["home_goal_minutes"]) == result["home_score"]
+
+    def test_json(self, aggregate: Aggregate) -> None:
+        file = io.StringIO()
+        out = writer(Format.json, file)
+        out.write(record(aggregate))
+        out.write(record(aggregate))
+        out.close()
+        assert json.loads(file.getvalue()) == [record(aggregate)] * 2
+
+    def test_json_empty(self) -> None:
+        file = io.StringIO()
+        writer(Format.json, file).close()
+        assert json.loads(file.getvalue()) == []
+
+    def test_abstract(self) -> None:
+        with pytest.raises(TypeError):
+            Writer(io.StringIO())  # type: ignore[abstract]
+
+    def test_jsonl(self, aggregate: Aggregate) -> None:
+        file = io.StringIO()
+        out = writer(Format.jsonl, file, flush=True)
+        out.write(record(aggregate))
+        # 每条记录写完就是完整的一行
+        assert json.loads(file.getvalue()) == record(aggregate)
+        out.write(record(aggregate))
+        out.close()
+        lines = file.getvalue().splitlines()
+        assert [json.loads(line) for line in lines] == [record(aggregate)] * 2
+
+    def test_csv(self, aggregate: Aggregate) -> None:
+        file = io.StringIO()
+        out = writer(Format.csv, file)
+        out.write(record(aggregate))
+        out.close()
+        (row,) = csv.DictReader(io.StringIO(file.getvalue()))
+        assert list(row) == FIELDS
+        assert row["home"] == "Juventus"
+        assert row["home_goal_minutes"] == " ".join(
+            map(str, record(aggregate)["home_goal_minutes"])
+        )
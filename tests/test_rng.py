@@ -0,0 +1,14 @@
+from score_simulator_py.rng import entropy, spawn
+
+
+def test_entropy() -> None:
+    assert 0 <= entropy() < 2**128
+    assert entropy() != entropy()
+
+
+def test_spawn() -> None:
+    assert spawn(42, 0) == spawn(42, 0)
+    assert spawn(42, 0) != spawn(42, 1)
+    assert spawn(42, 0) != spawn(43, 0)
+    assert spawn(42, "a", 1) != spawn(42, "a", 2)
+    assert 0 <= spawn(42) < 2**128
@@ -0,0 +1,145 @@
+import pytest
+
+from score_simulator_py import season
+from score_simulator_py.types import MatchTypes, StandingTypes
+
+
+def fixture(
+    home: str,
+    away: str,
+    home_score: int | None = None,
+    away_score: int | None = None,
+) -> MatchTypes:
+    return {
+        "name": f"{home} vs {away}",
+        "utc_time": "2023-12-08T19:45:00.000Z",
+        "finished": home_score is not None,
+        "competition": {"name": "Serie A", "logo": ""},
+        "home": {
+            "name": home,
+            "logo": "",
+            "shots": 195,
+            "xg": 22.7,
+            "score": home_score,
+            "played": 15,
+        },
+        "away": {
+            "name": away,
+            "logo": "",
+            "shots": 242,
+            "xg": 25.6,
+            "score": away_score,
+            "played": 15,
+        },
+    }
+
+
+@pytest.fixture
+def fixtures() -> list[MatchTypes]:
+    return [
+        fixture("Juventus", "Napoli", 1, 0),
+        fixture("Inter", "Milan", 2, 2),
+        fixture("Napoli", "Inter"),
+        fixture("Milan", "Juventus"),
+        fixture("Juventus", "Inter"),
+        fixture("Napoli", "Milan"),
+    ]
+
+
+class TestSeason:
+    def test_fixtures(self, fixtures: list[MatchTypes]) -> None:
+        data = {"2023-12-08": fixtures + [fixture("Lyon", "Lens")]}
+        data["2023-12-08"][-1]["competition"]["name"] = "Ligue 1"
+        assert season.fixtures(data, "Serie A") == fixtures
+
+    def test_fixtures_seasons(self, fixtures: list[MatchTypes]) -> None:
+        # 上赛季已全部结束, Cremonese 已降级
+        last = [
+            fixture("Juventus", "Cremonese", 2, 0),
+            fixture("Napoli", "Milan", 0, 0),
+        ]
+        data = {
+            "2023-05-20": last[:1],
+            "2023-06-04": last[1:],
+            "2023-08-20": fixtures[:2],
+            "2023-10-01": fixtures[2:4],
+            "2023-12-08": fixtures[4:],
+        }
+        current = season.fixtures(data, "Serie A")
+        assert current == fixtures
+        table = season.simulate(current, seasons=10, seed=1)
+        assert "Cremonese" not in table.teams
+        assert table.points[table.teams.index("Juventus")] >= 3
+        assert season.fixtures(data, "Serie A", "2023-05-01") == (
+            last + fixtures
+        )
+        assert season.fixtures(data, "Serie A", "2023-10-01") == fixtures[2:]
+
+    def test_fixtures_finished(self, fixtures: list[MatchTypes]) -> None:
+        # 全部结束时取最后一个赛季
+        data = {"2023-05-20": fixtures[:1], "2023-08-20": fixtures[1:2]}
+        assert season.fixtures(data, "Serie A") == fixtures[1:2]
+        assert season.fixtures({}, "Serie A") == []
+
+    def test_standings(self, fixtures: list[MatchTypes]) -> None:
+        table = season.standings(fixtures)
+        assert table["Juventus"] == {
+            "points": 3,
+            "goals_for": 1,
+            "goals_against": 0,
+        }
+        assert table["Napoli"]["points"] == 0
+        assert table["Inter"]["points"] == 1
+        assert table["Milan"]["goals_for"] == 2
+
+    def test_simulate(self, fixtures: list[MatchTypes]) -> None:
+        table = season.simulate(fixtures, seasons=2000, seed=1)
+        assert table.seasons == 2000
+        assert table.teams == ["Juventus", "Napoli", "Inter", "Milan"]
+        for row in table.positions:
+            assert sum(row) == pytest.approx(1)
+        for column in zip(*table.positions):
+            assert sum(column) == pytest.approx(1)
+        assert sum(table.top(team, 4) for team in table.teams) == (
+            pytest.approx(4)
+        )
+        # 已结束的比赛共 5 分, 之后每场比赛产生 2 或 3 分
+        assert 5 + 4 * 2 <= sum(table.points) <= 5 + 4 * 3
+        assert 1 <= table.expected_position("Juventus") <= 4
+
+    def test_seed(self, fixtures: list[MatchTypes]) -> None:
+        first = season.simulate(fixtures, seasons=100, seed=1)
+        second = season.simulate(fixtures, seasons=100, seed=1)
+        assert first == second
+
+    def test_chunks(
+        self, fixtures: list[MatchTypes], monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setattr(season, "CHUNK_SIZE", 7)
+        table = season.simulate(fixtures, seasons=100, seed=1)
+        for row in table.positions:
+            assert sum(row) == pytest.approx(1)
+
+    def test_finished(self, fixtures: list[MatchTypes]) -> None:
+        table = season.simulate(fixtures[:2], seasons=10, seed=1)
+        assert table.probability("Juventus", 1) == 1
+        assert table.bottom("Napoli", 1) == 1
+        assert table.points == [3, 0, 1, 1]
+
+    def test_current(self, fixtures: list[MatchTypes]) -> None:
+        current: dict[str, StandingTypes] = {
+            team: {"points": 0, "goals_for": 0, "goals_against": 0}
+            for team in ("Juventus", "Napoli", "Inter", "Milan")
+        }
+        current["Milan"]["points"] = 100
+        table = season.simulate(
+            fixtures,
+            seasons=100,
+            seed=1,
+            current=current,
+        )
+        assert table.probability("Milan", 1) == 1
+
+    def test_empty(self) -> None:
+        with pytest.raises(ValueError):
+            season.simulate([])
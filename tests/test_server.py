@@ -0,0 +1,186 @@
+import copy
+import json
+import threading
+import time
+from typing import Any, Generator
+from urllib.error import HTTPError
+from urllib.request import urlopen
+
+import pytest
+
+from score_simulator_py import server
+from score_simulator_py.api import Matches, simulate_many
+from score_simulator_py.models import Aggregate
+from score_simulator_py.server import Server, Simulator
+from score_simulator_py.types import MatchesTypes
+
+
+@pytest.fixture
+def simulator(
+    matches: Matches, today_matches_data: MatchesTypes
+) -> Generator[Simulator, Any, None]:
+    matches.save(today_matches_data)
+    simulator = Simulator(matches, interval=0.05)
+    simulator.start()
+    yield simulator
+    simulator.stop()
+    for file in (
+        matches.file,
+        matches.store_file,
+        matches.meta_file,
+        matches.lock_file,
+    ):
+        if file.exists():
+            file.unlink()
+    if matches.directory.exists():
+        matches.directory.rmdir()
+
+
+@pytest.fixture
+def url(simulator: Simulator) -> Generator[str, Any, None]:
+    httpd = Server(("127.0.0.1", 0), simulator)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_port}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def get(url: str) -> Any:
+    with urlopen(url) as response:
+        return json.loads(response.read())
+
+
+class TestSimulator:
+    def test_simulate_match(self, simulator: Simulator) -> None:
+        result = simulator.simulate_match(
+            "2023-12-08", "Juventus vs Napoli", steps=10, seed=1
+        )
+        assert result["home"] == "Juventus"
+        assert result["steps"] == 10
+        assert result == simulator.simulate_match(
+            "2023-12-08", "Juventus vs Napoli", steps=10, seed=1
+        )
+        assert len(simulator._models) == 1
+
+    def test_simulate_date(self, simulator: Simulator) -> None:
+        results = simulator.simulate_date("2023-12-08", steps=10, seed=1)
+        assert [result["away"] for result in results] == ["Napoli"]
+
+    def test_missing(self, simulator: Simulator) -> None:
+        with pytest.raises(KeyError):
+            simulator.simulate_match("2023-12-08", "Inter vs Milan")
+        with pytest.raises(KeyError):
+            simulator.simulate_date("2000-01-01")
+        with pytest.raises(ValueError):
+            simulator.simulate_match(
+                "2023-12-08", "Juventus vs Napoli", steps=0
+            )
+
+    def test_single_flight(
+        self, simulator: Simulator, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        calls = []
+
+        def slow(*args: Any, **kwargs: Any) -> list[Aggregate]:
+            calls.append(args)
+            time.sleep(0.2)
+            return simulate_many(*args, **kwargs)
+
+        monkeypatch.setattr(server, "simulate_many", slow)
+        results: list[dict[str, Any]] = []
+        threads = [
+            threading.Thread(
+                target=lambda: results.append(
+                    simulator.simulate_match(
+                        "2023-12-08", "Juventus vs Napoli", steps=10
+                    )
+                )
+            )
+            for _ in range(4)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert len(calls) == 1
+        assert len(results) == 4
+        assert all(result == results[0] for result in results)
+        assert simulator._inflight == {}
+
+    def test_reload(
+        self,
+        simulator: Simulator,
+        matches: Matches,
+        today_matches_data: MatchesTypes,
+    ) -> None:
+        assert not simulator.reload()
+        simulator.simulate_match("2023-12-08", "Juventus vs Napoli", steps=1)
+        matches.save(today_matches_data | {"2023-12-09": []})
+        for _ in range(100):
+            if "2023-12-09" in simulator._data:
+                break
+            time.sleep(0.01)
+        assert simulator.select("2023-12-09") == []
+        assert simulator._models == {}
+
+
+class TestServer:
+    def test_health(self, url: str) -> None:
+        assert get(f"{url}/health") == {"status": "ok"}
+        assert get(f"{url}/health?steps=x") == {"status": "ok"}
+
+    def test_match(self, url: str) -> None:
+        result = get(
+            f"{url}/match?date=2023-12-08&name=Juventus+vs+Napoli"
+            "&steps=10&seed=1&engine=numpy"
+        )
+        assert result["competition"] == "Serie A"
+        assert result["steps"] == 10
+
+    def test_date(self, url: str) -> None:
+        results = get(f"{url}/date?date=2023-12-08&steps=10")
+        assert len(results) == 1
+
+    @pytest.mark.parametrize(
+        "path, status",
+        [
+            ("/match?date=2023-12-08&name=Inter", 404),
+            ("/date?date=2000-01-01", 404),
+            ("/date", 400),
+            ("/date?date=2023-12-08&steps=x", 400),
+            ("/date?date=2023-12-08&engine=x", 400),
+            ("/unknown", 404),
+            ("/unknown?steps=x", 404),
+        ],
+    )
+    def test_error(self, url: str, path: str, status: int) -> None:
+        with pytest.raises(HTTPError) as e:
+            get(f"{url}{path}")
+        assert e.value.code == status
+
+    def test_invalid_data(
+        self,
+        url: str,
+        simulator: Simulator,
+        today_matches_data: MatchesTypes,
+    ) -> None:
+        match = copy.deepcopy(today_matches_data["2023-12-08"][0])
+        match["home"]["shots"] = 0
+        simulator._data = {"2023-12-08": [match]}
+        with pytest.raises(HTTPError) as e:
+            get(f"{url}/date?date=2023-12-08&steps=1")
+        assert e.value.code == 500
+        assert "no shots" in json.loads(e.value.read())["error"]
+
+    def test_internal_error(
+        self, url: str, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        def fail(*args: Any, **kwargs: Any) -> Any:
+            raise TypeError("boom")
+
+        monkeypatch.setattr(Simulator, "simulate_date", fail)
+        with pytest.raises(HTTPError) as e:
+            get(f"{url}/date?date=2023-12-08")
+        assert e.value.code == 500
+        assert json.loads(e.value.read()) == {"error": "boom"}
@@ -0,0 +1,77 @@
+import json
+import os
+import subprocess
+import sys
+import time
+from datetime import date as datelib
+from pathlib import Path
+
+import pytest
+
+from .data import matches as matches_data
+
+# 启动时间预算, 单位为秒
+VERSION_BUDGET = 0.75
+PLAY_BUDGET = 1.5
+LAZY_MODULES = ("httpx", "dotenv", "numpy", "score_simulator_py.api")
+ROOT = str(Path(__file__).parents[1])
+
+
+def run(
+    *args: str, cwd: Path, env: dict[str, str] | None = None
+) -> tuple[float, subprocess.CompletedProcess[str]]:
+    """运行 3 次取最短的时间, 减少机器负载带来的波动"""
+    times = []
+    for _ in range(3):
+        start = time.perf_counter()
+        process = subprocess.run(
+            [sys.executable, *args],
+            cwd=cwd,
+            env=os.environ | {"PYTHONPATH": ROOT} | (env or {}),
+            capture_output=True,
+            text=True,
+        )
+        times.append(time.perf_counter() - start)
+        assert process.returncode == 0, process.stderr
+    return min(times), process
+
+
+@pytest.fixture
+def data_dir(tmp_path: Path) -> Path:
+    today = datelib.today().strftime("%Y-%m-%d")
+    data = matches_data | {today: matches_data["2023-12-08"]}
+    Path(tmp_path, "matches.json").write_text(json.dumps(data))
+    return tmp_path
+
+
+def test_cli_import_is_lazy(tmp_path: Path) -> None:
+    code = (
+        "import sys, score_simulator_py.cli; "
+        f"print([m for m in {LAZY_MODULES!r} if m in sys.modules])"
+    )
+    _, process = run("-c", code, cwd=tmp_path)
+    assert process.stdout.strip() == "[]"
+
+
+def test_version_budget(tmp_path: Path) -> None:
+    code = "from score_simulator_py import app; app()"
+    elapsed, process = run("-c", code, "version", cwd=tmp_path)
+    assert "0.1.0" in process.stdout
+    assert elapsed < VERSION_BUDGET
+
+
+def test_warm_cache_play_budget(data_dir: Path) -> None:
+    code = "from score_simulator_py import app; app()"
+    elapsed, process = run(
+        "-X",
+        "importtime",
+        "-c",
+        code,
+        "play",
+        cwd=data_dir,
+        env={"SCORE_SIMULATOR_DATA": str(data_dir)},
+    )
+    assert "Juventus" in process.stdout
+    # 本地数据没有过期时不需要加载 httpx
+    assert "httpx" not in process.stderr
+    assert elapsed < PLAY_BUDGET
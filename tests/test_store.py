@@ -0,0 +1,99 @@
+import copy
+import json
+from pathlib import Path
+
+import pytest
+
+from score_simulator_py.store import MatchStore, encode
+
+from .data import matches as matches_data
+
+
+@pytest.fixture
+def source(tmp_path: Path) -> Path:
+    file = Path(tmp_path, "matches.json")
+    file.write_text(json.dumps(matches_data))
+    return file
+
+
+@pytest.fixture
+def store(tmp_path: Path, source: Path) -> MatchStore:
+    store = MatchStore(Path(tmp_path, "matches.db"))
+    store.build(matches_data | {"2023-12-09": []}, source)
+    return store
+
+
+def test_load(store: MatchStore) -> None:
+    assert store.load("2023-12-08") == matches_data["2023-12-08"]
+    assert store.load("2023-12-09") == []
+    with pytest.raises(KeyError):
+        store.load("2023-12-10")
+
+
+def test_dates(store: MatchStore) -> None:
+    assert store.dates() == ["2023-12-08", "2023-12-09"]
+
+
+def test_is_current(store: MatchStore, source: Path) -> None:
+    assert store.is_current(source)
+    source.write_text(json.dumps(matches_data | {"2023-12-10": []}))
+    assert not store.is_current(source)
+
+
+def test_is_current_invalid(tmp_path: Path, source: Path) -> None:
+    store = MatchStore(Path(tmp_path, "matches.db"))
+    assert not store.is_current(source)
+    store.file.write_bytes(b"not a store")
+    assert not store.is_current(source)
+
+
+def test_build_without_source(tmp_path: Path, source: Path) -> None:
+    store = MatchStore(Path(tmp_path, "matches.db"))
+    store.build(matches_data)
+    assert store.read() == matches_data
+    assert not store.is_current(source)
+
+
+def test_read(store: MatchStore) -> None:
+    assert store.read() == matches_data | {"2023-12-09": []}
+
+
+def test_merge(store: MatchStore) -> None:
+    match = copy.deepcopy(matches_data["2023-12-08"][0])
+    match["home"]["score"] = 2
+    changed = store.merge({"2023-12-08": [match], "2023-12-10": []})
+    assert changed == ["2023-12-08", "2023-12-10", "2023-12-09"]
+    assert store.dates() == ["2023-12-08", "2023-12-10"]
+    assert store.load("2023-12-08") == [match]
+    # 没有出现在 data 中的日期被删除
+    with pytest.raises(KeyError):
+        store.load("2023-12-09")
+
+
+def test_merge_unchanged(store: MatchStore) -> None:
+    content = store.file.read_bytes()
+    stat = store.file.stat()
+    assert store.merge(matches_data | {"2023-12-09": []}) == []
+    assert store.file.stat().st_mtime_ns == stat.st_mtime_ns
+    assert store.file.read_bytes() == content
+
+
+def test_merge_copies_unchanged(store: MatchStore) -> None:
+    blob = encode(matches_data["2023-12-08"])
+    store.merge(matches_data | {"2023-12-09": [matches_data["2023-12-08"][0]]})
+    assert blob in store.file.read_bytes()
+    assert store.load("2023-12-08") == matches_data["2023-12-08"]
+
+
+def test_merge_invalid(tmp_path: Path) -> None:
+    store = MatchStore(Path(tmp_path, "matches.db"))
+    store.file.write_bytes(b"not a store")
+    assert store.merge(matches_data) == ["2023-12-08"]
+    assert store.read() == matches_data
+
+
+def test_replaced(store: MatchStore) -> None:
+    # 文件被其他 MatchStore 替换后重新读取索引
+    MatchStore(store.file).build({"2023-12-10": []})
+    assert store.dates() == ["2023-12-10"]
+    assert store.load("2023-12-10") == []
@@ -0,0 +1,60 @@
+import math
+
+import pytest
+
+from score_simulator_py.api import Game
+from score_simulator_py.sweep import FIELDS, grid, parse_range, sweep
+
+from .data import matches as matches_data
+
+MATCH = matches_data["2023-12-08"][0]
+
+
+def test_parse_range() -> None:
+    assert parse_range("0.8:1.2:5") == pytest.approx([0.8, 0.9, 1, 1.1, 1.2])
+    assert parse_range("1:2:1") == [1]
+    assert parse_range("0.9,1,1.1") == [0.9, 1, 1.1]
+    with pytest.raises(ValueError):
+        parse_range("1:2:0")
+    with pytest.raises(ValueError):
+        parse_range("a,b")
+
+
+def test_grid() -> None:
+    points = grid({"home_xg": [0.9, 1.1], "away_shots": [1, 2, 3]})
+    assert len(points) == 6
+    assert points[0] == {"home_xg": 0.9, "away_shots": 1}
+    assert points[-1] == {"home_xg": 1.1, "away_shots": 3}
+    assert grid({}) == [{}]
+    with pytest.raises(ValueError):
+        grid({"home_goals": [1]})
+
+
+def test_sweep() -> None:
+    ranges = {"home_xg": parse_range("0.8:1.2:5"), "away_played": [1.0, 2]}
+    rows = sweep(MATCH, ranges, steps=2000, seed=1)
+    assert len(rows) == 10
+    assert list(rows[0]) == FIELDS
+    assert rows[0]["home_xg"] == pytest.approx(0.8)
+    assert rows[0]["away_played"] == 1
+    assert rows[0]["home_shots"] == 1
+    for result in rows:
+        total = result["home_win"] + result["draw"] + result["away_win"]
+        assert total == pytest.approx(1)
+        assert 0 < result["standard_error"] < 0.05
+    # 共用随机数, 主队 xg 越高主胜概率越高
+    home_wins = [result["home_win"] for result in rows[::2]]
+    assert home_wins == sorted(home_wins)
+    assert sweep(MATCH, ranges, steps=2000, seed=1) == rows
+
+
+def test_sweep_agrees_with_exact() -> None:
+    exact = Game(MATCH).play_from(0)
+    (result,) = sweep(MATCH, {}, steps=50_000, seed=1)
+    for prob, estimate in [
+        (exact.home_win, result["home_win"]),
+        (exact.draw, result["draw"]),
+        (exact.away_win, result["away_win"]),
+    ]:
+        assert abs(prob - estimate) < 4 * math.sqrt(prob * (1 - prob) / 50_000)
+    assert result["home_goals"] == pytest.approx(exact.home_goals, 0.02)